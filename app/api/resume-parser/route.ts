@@ -4,9 +4,55 @@ import { exec } from "child_process"
 import { promisify } from "util"
 import { join } from "path"
 import { tmpdir } from "os"
+import { createConnection } from "net"
 
 const execAsync = promisify(exec)
 
+// Per-stage timings are attached when the parser profiled this upload (--profile or sampling)
+function logParserTimings(fileName: string, timings: unknown) {
+  if (timings) {
+    console.log("Resume parser timings", JSON.stringify({ file: fileName, timings }))
+  }
+}
+
+// Raised when a pipeline worker's job queue is full; the upload should be retried later
+class ParserBusyError extends Error {}
+
+// Send one job to a long-lived parser worker (`resume_parser_gemini.py --serve --socket ...`
+// or `parse_pipeline.py --serve --socket ...`)
+function parseWithWorker(socketPath: string, job: Record<string, unknown>): Promise<any> {
+  return new Promise((resolve, reject) => {
+    const socket = createConnection(socketPath)
+    let buffer = ""
+
+    socket.setEncoding("utf8")
+    socket.setTimeout(120000)
+    socket.on("connect", () => socket.write(JSON.stringify(job) + "\n"))
+    socket.on("data", (chunk: string) => {
+      buffer += chunk
+      const newlineIndex = buffer.indexOf("\n")
+      if (newlineIndex === -1) return
+
+      socket.end()
+      try {
+        const response = JSON.parse(buffer.slice(0, newlineIndex))
+        if (response.ok) {
+          logParserTimings(String(job.filename || ""), response.timings)
+          resolve(response.result)
+        } else if (response.retry) {
+          reject(new ParserBusyError(response.error || "Parser worker is busy"))
+        } else {
+          reject(new Error(response.error || "Parser worker failed"))
+        }
+      } catch (jsonError) {
+        reject(jsonError)
+      }
+    })
+    socket.on("timeout", () => socket.destroy(new Error("Parser worker timed out")))
+    socket.on("error", reject)
+  })
+}
+
 export async function POST(request: Request) {
   let tempFilePath = ""
   try {
@@ -38,6 +84,28 @@ export async function POST(request: Request) {
       // Get Gemini API key from environment variable
       const geminiApiKey = process.env.GEMINI_API_KEY || ""
 
+      // Prefer the persistent worker when one is running, to avoid a Python process per upload
+      const workerSocket = process.env.RESUME_PARSER_SOCKET
+      if (workerSocket) {
+        try {
+          const parsedData = await parseWithWorker(workerSocket, {
+            id: tempFilePath,
+            pdf_path: tempFilePath,
+            filename: fileName,
+          })
+          return NextResponse.json(parsedData)
+        } catch (workerError) {
+          // Spawning a parser process here would add load the pipeline just turned away
+          if (workerError instanceof ParserBusyError) {
+            return NextResponse.json(
+              { error: "Resume parser is busy, please try again shortly" },
+              { status: 503, headers: { "Retry-After": "5" } }
+            )
+          }
+          console.error("Parser worker error, falling back to script:", workerError)
+        }
+      }
+
       // Run Python script to parse resume
       const scriptPath = join(process.cwd(), "scripts", "resume_parser_gemini.py")
       const filePath = `"${tempFilePath}"`; // Handle spaces in the file path
@@ -69,7 +137,8 @@ export async function POST(request: Request) {
 
       // Parse the JSON output from Python script
       try {
-        const parsedData = JSON.parse(stdout)
+        const { timings, ...parsedData } = JSON.parse(stdout)
+        logParserTimings(fileName, timings)
         return NextResponse.json(parsedData)
       } catch (jsonError) {
         console.error("Failed to parse Python script output:", jsonError)
@@ -0,0 +1,399 @@
+import argparse
+import heapq
+import json
+import math
+import os
+import re
+import shlex
+import sys
+import time
+from array import array
+from collections import Counter
+
+import numpy as np
+
+from candidate_record import CandidateRecord
+from llm_json import EDUCATION_LEVELS
+from rank_candidates import read_candidates
+from skill_matcher import get_default_matcher, normalize_skill
+
+INDEX_FORMAT_VERSION = 1
+# Append-only log of indexed candidates; the .npy files are a compacted snapshot of its head
+LOG_FILE = "candidates.jsonl"
+META_FILE = "meta.json"
+ARRAY_FILES = ("offsets", "postings", "frequencies", "doc_lengths", "experience", "doc_offsets")
+
+# Field prefixes a query may use; bare words search every token field
+FIELDS = ("skill", "name", "school", "year", "email")
+TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text):
+    """Lowercase word tokens, keeping the '+', '#' and '.' of names like c++, c# and node.js."""
+    return [token.rstrip('.') for token in TOKEN_PATTERN.findall(str(text).lower())]
+
+
+def canonical_skill(skill):
+    """Taxonomy name of a skill or alias, so "ReactJS" and "react" share one posting list."""
+    normalized = normalize_skill(str(skill))
+    return get_default_matcher().canonical.get(normalized, normalized)
+
+
+def candidate_terms(record):
+    """Term frequencies of one CandidateRecord, and its length in bare tokens for BM25."""
+    terms = Counter()
+    for skill in record.skills:
+        terms["skill:" + canonical_skill(skill)] = 1
+        terms.update(tokenize(skill))
+    for token in tokenize(record.name):
+        terms["name:" + token] += 1
+        terms[token] += 1
+    for level in EDUCATION_LEVELS:
+        entry = getattr(record, level)
+        for token in tokenize(entry.school):
+            terms["school:" + token] += 1
+            terms[token] += 1
+        if entry.year_value:
+            terms[f"year:{entry.year_value}"] += 1
+    if record.email:
+        terms["email:" + record.email.strip().lower()] = 1
+    length = sum(count for term, count in terms.items() if ':' not in term)
+    return terms, length
+
+
+def parse_query(query):
+    """Parse a boolean query into OR-ed groups of (required terms, excluded terms).
+
+    Terms are AND-ed by default, OR separates groups, and NOT or a leading '-'
+    excludes a term. Prefix a term with a field (skill:, name:, school:, year:,
+    email:) to search that field only; quote multi-word values, as in
+    skill:"machine learning".
+    """
+    groups = [([], [])]
+    negate = False
+    for word in shlex.split(query):
+        if word == "OR":
+            groups.append(([], []))
+            continue
+        if word == "AND":
+            continue
+        if word == "NOT":
+            negate = True
+            continue
+        if word.startswith('-') and len(word) > 1:
+            negate, word = True, word[1:]
+
+        field, _, value = word.partition(':')
+        if value and field in FIELDS:
+            if field == "skill":
+                terms = ["skill:" + canonical_skill(value)]
+            elif field == "email":
+                terms = ["email:" + value.strip().lower()]
+            else:
+                terms = [f"{field}:{token}" for token in tokenize(value)]
+        else:
+            terms = tokenize(word)
+
+        required, excluded = groups[-1]
+        if negate:
+            # NOT "two words" excludes candidates having all of them; approximate with each word
+            excluded.extend(terms)
+        else:
+            required.extend(terms)
+        negate = False
+    return [group for group in groups if group[0] or group[1]]
+
+
+class CandidateIndex:
+    """Inverted index over parsed candidates, kept in a directory.
+
+    Each term (a canonical skill, a name/school token, a year, ...) maps to a
+    sorted uint32 array of document ids with a parallel array of term counts.
+    Document ids follow the order of the append-only candidates.jsonl log, so
+    appending a candidate only ever extends posting lists at the end. Saved
+    postings are concatenated into single .npy arrays and memory-mapped when
+    loaded; candidates appended since then live in small in-memory tails until
+    the next save() compacts them in.
+    """
+
+    def __init__(self, index_dir):
+        self.index_dir = index_dir
+        os.makedirs(index_dir, exist_ok=True)
+        self.term_ids = {}
+        self.arrays = {
+            "offsets": np.zeros(1, dtype=np.int64),
+            "postings": np.zeros(0, dtype=np.uint32),
+            "frequencies": np.zeros(0, dtype=np.uint16),
+            "doc_lengths": np.zeros(0, dtype=np.uint16),
+            "experience": np.zeros(0, dtype=np.int16),
+            "doc_offsets": np.zeros(0, dtype=np.int64)
+        }
+        self.indexed_bytes = 0
+        self._load()
+
+        # Candidates appended since the last save
+        self._tail_postings = {}
+        self._tail_lengths = array('H')
+        self._tail_experience = array('h')
+        self._tail_offsets = array('q')
+        self._total_length = int(self.arrays["doc_lengths"].sum(dtype=np.int64))
+        self.refresh()
+
+    def _path(self, name):
+        return os.path.join(self.index_dir, name)
+
+    def _load(self):
+        if not os.path.exists(self._path(META_FILE)):
+            return
+        with open(self._path(META_FILE), 'r') as f:
+            meta = json.load(f)
+        if meta.get("format") != INDEX_FORMAT_VERSION:
+            raise ValueError(f"{self.index_dir} uses index format {meta.get('format')}; rebuild it")
+        self.term_ids = {term: term_id for term_id, term in enumerate(meta["terms"])}
+        self.indexed_bytes = meta["indexed_bytes"]
+        for name in ARRAY_FILES:
+            self.arrays[name] = np.load(self._path(f"{name}.npy"), mmap_mode='r')
+
+    @property
+    def doc_count(self):
+        return len(self.arrays["doc_lengths"]) + len(self._tail_lengths)
+
+    def add(self, candidate):
+        """Append one parsed candidate (a dict or CandidateRecord) to the log and the index."""
+        self.add_many([candidate])
+
+    def add_many(self, candidates):
+        """Append parsed candidates to the log and the index. Returns how many were added."""
+        # Pick up other writers' lines first so our offsets continue from the real end of the log
+        self.refresh()
+        count = 0
+        with open(self._path(LOG_FILE), 'ab') as f:
+            offset = f.tell()
+            for candidate in candidates:
+                record = candidate if isinstance(candidate, CandidateRecord) else CandidateRecord.from_dict(candidate)
+                line = (json.dumps(record.to_dict()) + "\n").encode('utf-8')
+                f.write(line)
+                self._index_record(record, offset)
+                offset += len(line)
+                count += 1
+        self.indexed_bytes = offset
+        return count
+
+    def refresh(self):
+        """Index candidates appended to the log by other writers since it was last read."""
+        log_path = self._path(LOG_FILE)
+        if not os.path.exists(log_path) or os.path.getsize(log_path) <= self.indexed_bytes:
+            return 0
+        count = 0
+        with open(log_path, 'rb') as f:
+            f.seek(self.indexed_bytes)
+            offset = self.indexed_bytes
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # A writer is mid-append; pick the line up next time
+                    break
+                try:
+                    record = CandidateRecord.from_dict(json.loads(line))
+                except (ValueError, AttributeError) as e:
+                    print(f"Skipping unreadable candidate at byte {offset}: {e}", file=sys.stderr)
+                else:
+                    self._index_record(record, offset)
+                    count += 1
+                offset += len(line)
+            self.indexed_bytes = offset
+        return count
+
+    def _index_record(self, record, offset):
+        doc_id = self.doc_count
+        terms, length = candidate_terms(record)
+        for term, count in terms.items():
+            tail = self._tail_postings.get(term)
+            if tail is None:
+                tail = self._tail_postings[term] = (array('I'), array('H'))
+            tail[0].append(doc_id)
+            tail[1].append(min(count, 0xFFFF))
+        self._tail_lengths.append(min(length, 0xFFFF))
+        self._tail_experience.append(min(record.experience_years, 0x7FFF) if record.experience_years is not None else -1)
+        self._tail_offsets.append(offset)
+        self._total_length += length
+
+    def postings(self, term):
+        """Sorted document ids containing term, and the term's count in each."""
+        term_id = self.term_ids.get(term)
+        if term_id is not None:
+            start, end = self.arrays["offsets"][term_id], self.arrays["offsets"][term_id + 1]
+            ids, frequencies = self.arrays["postings"][start:end], self.arrays["frequencies"][start:end]
+        else:
+            ids, frequencies = self.arrays["postings"][:0], self.arrays["frequencies"][:0]
+        tail = self._tail_postings.get(term)
+        if tail:
+            ids = np.concatenate((ids, np.frombuffer(tail[0], dtype=np.uint32)))
+            frequencies = np.concatenate((frequencies, np.frombuffer(tail[1], dtype=np.uint16)))
+        return ids, frequencies
+
+    def _experience(self):
+        if not self._tail_experience:
+            return self.arrays["experience"]
+        return np.concatenate((self.arrays["experience"], np.frombuffer(self._tail_experience, dtype=np.int16)))
+
+    def _doc_lengths(self):
+        if not self._tail_lengths:
+            return self.arrays["doc_lengths"]
+        return np.concatenate((self.arrays["doc_lengths"], np.frombuffer(self._tail_lengths, dtype=np.uint16)))
+
+    def match(self, query, min_experience=None):
+        """Sorted ids of the candidates matching a boolean query (see parse_query)."""
+        matches = []
+        for required, excluded in parse_query(query):
+            if required:
+                lists = sorted((self.postings(term)[0] for term in required), key=len)
+                ids = lists[0]
+                for other in lists[1:]:
+                    if not len(ids):
+                        break
+                    ids = np.intersect1d(ids, other, assume_unique=True)
+            else:
+                ids = np.arange(self.doc_count, dtype=np.uint32)
+            for term in excluded:
+                if not len(ids):
+                    break
+                ids = np.setdiff1d(ids, self.postings(term)[0], assume_unique=True)
+            if len(ids):
+                matches.append(ids)
+        if not matches:
+            return np.zeros(0, dtype=np.uint32)
+        # One sort for all OR-ed groups rather than a pairwise union per group
+        result = matches[0] if len(matches) == 1 else np.unique(np.concatenate(matches))
+        if min_experience is not None and len(result):
+            result = result[self._experience()[result] >= min_experience]
+        return result
+
+    def search(self, query, top_k=10, min_experience=None):
+        """Top-K (doc id, BM25 score) pairs among the candidates matching query, best first."""
+        matched = self.match(query, min_experience)
+        if not len(matched):
+            return []
+
+        doc_count = self.doc_count
+        lengths = self._doc_lengths()
+        average_length = self._total_length / doc_count if doc_count else 0.0
+        scores = np.zeros(doc_count, dtype=np.float32)
+        terms = {term for required, _ in parse_query(query) for term in required}
+        for term in terms:
+            ids, frequencies = self.postings(term)
+            if not len(ids):
+                continue
+            idf = math.log(1 + (doc_count - len(ids) + 0.5) / (len(ids) + 0.5))
+            tf = frequencies.astype(np.float32)
+            if ':' in term and not term.startswith(("name:", "school:")):
+                # Skills, years and emails are present or not; only token fields have lengths
+                scores[ids] += idf
+            else:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[ids] / max(average_length, 1.0))
+                scores[ids] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+        matched_scores = scores[matched]
+        if top_k and top_k < len(matched):
+            best = np.argpartition(-matched_scores, top_k - 1)[:top_k]
+        else:
+            best = np.arange(len(matched))
+        ranked = heapq.nlargest(len(best), ((float(matched_scores[i]), int(matched[i])) for i in best))
+        return [(doc_id, score) for score, doc_id in ranked]
+
+    def get(self, doc_id):
+        """The stored candidate JSON for a document id."""
+        base = len(self.arrays["doc_offsets"])
+        offset = self.arrays["doc_offsets"][doc_id] if doc_id < base else self._tail_offsets[doc_id - base]
+        with open(self._path(LOG_FILE), 'rb') as f:
+            f.seek(int(offset))
+            return json.loads(f.readline())
+
+    def save(self):
+        """Compact the in-memory tails into the snapshot arrays and write them out."""
+        terms = list(self.term_ids)
+        terms.extend(term for term in self._tail_postings if term not in self.term_ids)
+
+        id_pieces, frequency_pieces, lengths = [], [], np.zeros(len(terms), dtype=np.int64)
+        for term_id, term in enumerate(terms):
+            ids, frequencies = self.postings(term)
+            id_pieces.append(ids)
+            frequency_pieces.append(frequencies)
+            lengths[term_id] = len(ids)
+        offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+
+        arrays = {
+            "offsets": offsets,
+            "postings": np.concatenate(id_pieces).astype(np.uint32) if id_pieces else np.zeros(0, dtype=np.uint32),
+            "frequencies": np.concatenate(frequency_pieces).astype(np.uint16) if frequency_pieces else np.zeros(0, dtype=np.uint16),
+            "doc_lengths": self._doc_lengths(),
+            "experience": self._experience(),
+            "doc_offsets": np.concatenate((self.arrays["doc_offsets"], np.frombuffer(self._tail_offsets, dtype=np.int64)))
+        }
+        # Write beside the live files and swap them in, so readers never see half an index
+        for name, values in arrays.items():
+            np.save(self._path(f"{name}.tmp.npy"), values)
+        for name in arrays:
+            os.replace(self._path(f"{name}.tmp.npy"), self._path(f"{name}.npy"))
+        meta = {"format": INDEX_FORMAT_VERSION, "indexed_bytes": self.indexed_bytes, "documents": self.doc_count, "terms": terms}
+        with open(self._path(f"{META_FILE}.tmp"), 'w') as f:
+            json.dump(meta, f)
+        os.replace(self._path(f"{META_FILE}.tmp"), self._path(META_FILE))
+
+        self.term_ids = {term: term_id for term_id, term in enumerate(terms)}
+        for name in ARRAY_FILES:
+            self.arrays[name] = np.load(self._path(f"{name}.npy"), mmap_mode='r')
+        self._tail_postings = {}
+        self._tail_lengths = array('H')
+        self._tail_experience = array('h')
+        self._tail_offsets = array('q')
+
+    def stats(self):
+        return {
+            "documents": self.doc_count,
+            "terms": len(set(self.term_ids) | set(self._tail_postings)),
+            "postings": int(len(self.arrays["postings"]) + sum(len(ids) for ids, _ in self._tail_postings.values())),
+            "unsaved_documents": len(self._tail_lengths)
+        }
+
+
+# Example usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build and query a local inverted index of parsed candidates")
+    parser.add_argument("index_dir", help="Directory holding the index (created if missing)")
+    parser.add_argument("--add", help="JSONL of parse results or resume_batch.py records to append ('-' for stdin)")
+    parser.add_argument("--query", help='Boolean query, e.g. \'skill:python skill:"machine learning" OR skill:go -year:2010\'')
+    parser.add_argument("--top_k", type=int, default=10, help="Number of BM25-ranked candidates to return (0 for all matches)")
+    parser.add_argument("--min_experience", type=int, help="Only match candidates with at least this many years of experience")
+    parser.add_argument("--count", action="store_true", help="Print only the number of matching candidates")
+    args = parser.parse_args()
+
+    index = CandidateIndex(args.index_dir)
+
+    if args.add:
+        start = time.perf_counter()
+        if args.add == '-':
+            added = index.add_many(read_candidates(sys.stdin))
+        else:
+            with open(args.add, 'r') as f:
+                added = index.add_many(read_candidates(f))
+        index.save()
+        print(f"Indexed {added} candidates in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+    if args.query:
+        start = time.perf_counter()
+        if args.count:
+            matches = len(index.match(args.query, args.min_experience))
+            elapsed = time.perf_counter() - start
+            print(json.dumps({"matches": matches}))
+        else:
+            results = index.search(args.query, args.top_k or None, args.min_experience)
+            elapsed = time.perf_counter() - start
+            for rank, (doc_id, score) in enumerate(results, 1):
+                print(json.dumps(dict(index.get(doc_id), searchScore=round(score, 4), rank=rank)))
+        print(f"Query answered in {elapsed * 1000:.2f}ms", file=sys.stderr)
+    elif not args.add:
+        print(json.dumps(index.stats(), indent=2))
@@ -0,0 +1,112 @@
+from llm_json import EDUCATION_LEVELS
+from resume_patterns import FIELD_DECIMAL, FIELD_INTEGER
+
+CANDIDATE_FIELDS = ("name", "email", "phone", "skills", "experience", "education", "candidateId", "matchScore")
+
+
+def parse_integer(value):
+    """First whole number in a field value, or None."""
+    match = FIELD_INTEGER.search(str(value)) if value is not None else None
+    return int(match.group('number')) if match else None
+
+
+def parse_decimal(value):
+    """First (possibly fractional) number in a field value, or None."""
+    match = FIELD_DECIMAL.search(str(value)) if value is not None else None
+    return float(match.group('number')) if match else None
+
+
+def _text(value):
+    return "" if value is None else str(value)
+
+
+class EducationEntry:
+    """School, year and percentage of one schooling level.
+
+    The strings are kept as extracted so the entry serializes unchanged; the year
+    and percentage are also parsed to numbers once, here, for scoring.
+    """
+
+    __slots__ = ("school", "year", "percentage", "year_value", "percentage_value")
+
+    def __init__(self, school="", year="", percentage=""):
+        self.school = _text(school)
+        self.year = _text(year)
+        self.percentage = _text(percentage)
+        self.year_value = parse_integer(year)
+        self.percentage_value = parse_decimal(percentage)
+
+    @classmethod
+    def from_dict(cls, data):
+        if not isinstance(data, dict):
+            return cls()
+        return cls(data.get("school", ""), data.get("year", ""), data.get("percentage", ""))
+
+    def to_dict(self):
+        return {"school": self.school, "year": self.year, "percentage": self.percentage}
+
+
+class CandidateRecord:
+    """Compact, slotted form of a parsed candidate for holding many in memory.
+
+    Skills are a tuple and education levels are EducationEntry objects rather
+    than nested dicts. Years of experience and the education percentages are
+    parsed at construction, so ranking loops never run a regex per candidate.
+    Keys outside the candidate schema are kept in `extra` and written back by
+    to_dict(), which returns the same JSON shape the parser produces.
+    """
+
+    __slots__ = (
+        "name", "email", "phone", "skills", "experience", "experience_years",
+        "tenth", "twelfth", "candidate_id", "match_score", "extra"
+    )
+
+    def __init__(self, name="", email="", phone="", skills=(), experience="", tenth=None, twelfth=None,
+                 candidate_id=None, match_score=None, extra=None):
+        self.name = _text(name)
+        self.email = _text(email)
+        self.phone = _text(phone)
+        # Anything but a list of skills scores zero, as it always has
+        self.skills = tuple(str(skill) for skill in skills) if isinstance(skills, (list, tuple)) else ()
+        self.experience = _text(experience)
+        self.experience_years = parse_integer(experience)
+        self.tenth = tenth or EducationEntry()
+        self.twelfth = twelfth or EducationEntry()
+        self.candidate_id = candidate_id
+        self.match_score = match_score
+        self.extra = extra or None
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from a parse result, LLM reply or cached entry."""
+        education = data.get("education")
+        if not isinstance(education, dict):
+            education = {}
+        extra = {key: value for key, value in data.items() if key not in CANDIDATE_FIELDS}
+        return cls(
+            data.get("name", ""), data.get("email", ""), data.get("phone", ""), data.get("skills", []),
+            data.get("experience", ""), EducationEntry.from_dict(education.get("tenth")),
+            EducationEntry.from_dict(education.get("twelfth")), data.get("candidateId"), data.get("matchScore"), extra
+        )
+
+    def education_percentages(self):
+        """Parsed percentage of each schooling level, None where there is none."""
+        return tuple(getattr(self, level).percentage_value for level in EDUCATION_LEVELS)
+
+    def to_dict(self):
+        """The candidate in the parser's JSON shape."""
+        data = {
+            "name": self.name,
+            "email": self.email,
+            "phone": self.phone,
+            "skills": list(self.skills),
+            "experience": self.experience,
+            "education": {level: getattr(self, level).to_dict() for level in EDUCATION_LEVELS}
+        }
+        if self.extra:
+            data.update(self.extra)
+        if self.candidate_id is not None:
+            data["candidateId"] = self.candidate_id
+        if self.match_score is not None:
+            data["matchScore"] = self.match_score
+        return data
@@ -0,0 +1,130 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from pdf_text import PDF_BACKENDS, extract_text_from_pdf, get_backend
+from resume_batch import collect_pdf_paths
+from resume_benchmark import summarize
+from resume_parser import extract_email, extract_phone, extract_skills, extract_experience, extract_education
+from resume_sections import segment_sections
+from synthetic_resumes import generate_resume, load_skill_names, text_to_pdf_bytes
+
+
+def token_overlap(first, second):
+    """Dice overlap of the two texts' word multisets: 1.0 for the same words in any layout."""
+    first_tokens, second_tokens = Counter(first.lower().split()), Counter(second.lower().split())
+    total = sum(first_tokens.values()) + sum(second_tokens.values())
+    if not total:
+        return 1.0
+    return 2 * sum((first_tokens & second_tokens).values()) / total
+
+
+def regex_fields(text):
+    """The downstream regex fields, to check a backend doesn't change what gets extracted."""
+    sections = segment_sections(text)
+    return {
+        "email": extract_email(text),
+        "phone": extract_phone(text),
+        "skills": sorted(extract_skills(text, sections)),
+        "experience": extract_experience(text, sections),
+        "education": extract_education(text, sections)
+    }
+
+
+def time_backend(backend, pdf_paths, repeats=1):
+    """Extract every PDF with one backend; returns (texts, latency samples in ms)."""
+    texts, samples = [], []
+    # Extraction problems are reported per backend below; keep their stderr lines out of the way
+    with contextlib.redirect_stderr(io.StringIO()):
+        extract_text_from_pdf(pdf_paths[0], backend=backend)  # warm imports and caches
+        for repeat in range(repeats):
+            for path in pdf_paths:
+                start = time.perf_counter()
+                text = extract_text_from_pdf(path, backend=backend)
+                samples.append((time.perf_counter() - start) * 1000)
+                if repeat == 0:
+                    texts.append(text)
+    return texts, samples
+
+
+def compare_backends(pdf_paths, backends, repeats=1):
+    """Time each backend over the corpus and diff its text and regex fields against the first one."""
+    baseline_name = backends[0]
+    results = {name: time_backend(name, pdf_paths, repeats) for name in backends}
+    baseline_texts = results[baseline_name][0]
+    baseline_fields = [regex_fields(text) for text in baseline_texts]
+    baseline_ms = sum(results[baseline_name][1])
+
+    report = {}
+    for name in backends:
+        texts, samples = results[name]
+        stats = summarize(samples)
+        stats["empty_texts"] = sum(1 for text in texts if not text.strip())
+        stats["speedup"] = round(baseline_ms / sum(samples), 2) if sum(samples) else 0.0
+        if name != baseline_name:
+            overlaps = [token_overlap(text, base) for text, base in zip(texts, baseline_texts)]
+            fields = [regex_fields(text) for text in texts]
+            stats["vs_" + baseline_name] = {
+                "mean_token_overlap": round(sum(overlaps) / len(overlaps), 4),
+                "min_token_overlap": round(min(overlaps), 4),
+                "mean_length_ratio": round(
+                    sum(len(text) / len(base) if base else 1.0 for text, base in zip(texts, baseline_texts)) / len(texts), 4
+                ),
+                "field_agreement": {
+                    field: round(sum(mine[field] == theirs[field] for mine, theirs in zip(fields, baseline_fields)) / len(fields), 4)
+                    for field in baseline_fields[0]
+                },
+                "least_similar": [
+                    {"pdf_path": pdf_paths[index], "token_overlap": round(overlaps[index], 4)}
+                    for index in sorted(range(len(overlaps)), key=overlaps.__getitem__)[:5]
+                ]
+            }
+        report[name] = stats
+    return {"documents": len(pdf_paths), "repeats": repeats, "baseline": baseline_name, "backends": report}
+
+
+# Example usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare PDF text backends for speed and output differences")
+    parser.add_argument("source", nargs="?", help="Directory, glob pattern or manifest of PDFs (omit to use --synthetic)")
+    parser.add_argument("--backends", default=",".join(sorted(PDF_BACKENDS, key=lambda name: name != "pypdf2")),
+                        help="Comma-separated backends; the first is the baseline (defaults to every installed one)")
+    parser.add_argument("--synthetic", type=int, default=50, help="Synthetic resumes to generate when no source is given")
+    parser.add_argument("--repeats", type=int, default=1, help="Timed passes over the corpus per backend")
+    parser.add_argument("-o", "--output", help="Write the JSON report here (defaults to stdout)")
+    args = parser.parse_args()
+
+    backends = [name.strip() for name in args.backends.split(',') if name.strip()]
+    try:
+        for name in backends:
+            get_backend(name)
+    except ValueError as e:
+        parser.error(str(e))
+
+    with tempfile.TemporaryDirectory(prefix="pdf-backends-") as work_dir:
+        if args.source:
+            pdf_paths = collect_pdf_paths(args.source)
+        else:
+            skill_names = load_skill_names()
+            pdf_paths = []
+            for index in range(args.synthetic):
+                pdf_path = os.path.join(work_dir, f"resume_{index:05d}.pdf")
+                with open(pdf_path, 'wb') as f:
+                    f.write(text_to_pdf_bytes(generate_resume(index, skill_names=skill_names)[0]))
+                pdf_paths.append(pdf_path)
+        if not pdf_paths:
+            print(f"No PDF files found for {args.source}", file=sys.stderr)
+            sys.exit(1)
+        report = compare_backends(pdf_paths, backends, args.repeats)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
@@ -0,0 +1,116 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from resume_parser import extract_education
+
+DEFAULT_CORPUS_PATH = Path(__file__).parent / "education_corpus.json"
+FIELDS = ("school", "year", "percentage")
+
+# Inputs that made the old ".*?" education patterns backtrack: many anchors with
+# nothing to capture, anchors followed by one long unbroken line, and long runs of
+# text that almost look like a school name
+ADVERSARIAL_INPUTS = {
+    "repeated_roman_numeral": lambda size: "X " * (size // 2),
+    "repeated_lowercase_x": lambda size: "x " * (size // 2),
+    "anchor_then_long_line": lambda size: "10th " + "a" * size,
+    "anchor_then_name_without_keyword": lambda size: "SSC from " + "Abc " * (size // 4),
+    "anchors_without_fields": lambda size: "12th and 10th and HSC and SSC " * (size // 30),
+}
+
+
+def time_call(text, repeats):
+    """Best-of-repeats wall time of extract_education(text), in milliseconds."""
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        extract_education(text)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_corpus(cases, repeats=3):
+    """Per-field accuracy over labelled cases, plus the slowest case."""
+    correct = {field: 0 for field in FIELDS}
+    total = 0
+    failures = []
+    slowest = {"id": None, "ms": 0.0}
+
+    for case in cases:
+        result = extract_education(case["text"])
+        for level, expected in case["expected"].items():
+            total += 1
+            for field in FIELDS:
+                if result[level][field] == expected[field]:
+                    correct[field] += 1
+                else:
+                    failures.append({
+                        "id": case["id"], "level": level, "field": field,
+                        "expected": expected[field], "got": result[level][field]
+                    })
+        elapsed = time_call(case["text"], repeats)
+        if elapsed > slowest["ms"]:
+            slowest = {"id": case["id"], "ms": round(elapsed, 3)}
+
+    accuracy = {field: round(correct[field] / total, 4) if total else 1.0 for field in FIELDS}
+    overall = round(sum(correct.values()) / (total * len(FIELDS)), 4) if total else 1.0
+    return {"cases": len(cases), "accuracy": accuracy, "overall_accuracy": overall,
+            "slowest_case": slowest, "failures": failures}
+
+
+def run_adversarial(sizes, repeats=3):
+    """Latency of each adversarial input at each size, and how it grows with size."""
+    results = {}
+    for name, build in ADVERSARIAL_INPUTS.items():
+        timings = {size: time_call(build(size), repeats) for size in sizes}
+        smallest, largest = min(sizes), max(sizes)
+        # ~1.0 for linear time; quadratic backtracking shows up as roughly largest/smallest
+        growth = (timings[largest] / largest) / max(timings[smallest] / smallest, 1e-9)
+        results[name] = {
+            "ms_by_size": {str(size): round(ms, 3) for size, ms in timings.items()},
+            "per_char_growth": round(growth, 2)
+        }
+    return results
+
+
+# Example usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check education extraction accuracy and worst-case latency against a labelled corpus")
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS_PATH), help="Labelled corpus JSON file")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated adversarial input sizes in characters")
+    parser.add_argument("--repeats", type=int, default=3, help="Timing repeats per input (best is reported)")
+    parser.add_argument("--min_accuracy", type=float, default=0.95, help="Fail below this overall field accuracy")
+    parser.add_argument("--max_ms", type=float, default=1000.0, help="Fail if any input takes longer than this")
+    parser.add_argument("--max_growth", type=float, default=4.0, help="Fail if per-character time grows more than this from the smallest to the largest size")
+    args = parser.parse_args()
+
+    with open(args.corpus, 'r') as f:
+        corpus = json.load(f)
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+
+    report = {
+        "corpus": run_corpus(corpus["cases"], args.repeats),
+        "adversarial": run_adversarial(sizes, args.repeats)
+    }
+    worst_ms = max(
+        [report["corpus"]["slowest_case"]["ms"]]
+        + [ms for entry in report["adversarial"].values() for ms in entry["ms_by_size"].values()]
+    )
+    report["worst_case_ms"] = round(worst_ms, 3)
+    print(json.dumps(report, indent=2))
+
+    problems = []
+    if report["corpus"]["overall_accuracy"] < args.min_accuracy:
+        problems.append(f"accuracy {report['corpus']['overall_accuracy']} is below {args.min_accuracy}")
+    if worst_ms > args.max_ms:
+        problems.append(f"worst-case latency {worst_ms:.1f}ms is above {args.max_ms}ms")
+    for name, entry in report["adversarial"].items():
+        if entry["per_char_growth"] > args.max_growth:
+            problems.append(f"{name} grows super-linearly (x{entry['per_char_growth']} per char)")
+
+    for problem in problems:
+        print(f"Regression: {problem}", file=sys.stderr)
+    sys.exit(1 if problems else 0)
@@ -0,0 +1,162 @@
+import asyncio
+import os
+import random
+import sys
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Override GEMINI_API_URL to point the parser at a local stub server
+GEMINI_API_URL = os.environ.get(
+    "GEMINI_API_URL",
+    "https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-pro:generateContent"
+)
+
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+DEFAULT_TIMEOUT = 60
+DEFAULT_MAX_RETRIES = 4
+# Total seconds one synchronous call may spend across all attempts; a full request plus a
+# targeted re-request must fit in the pipeline's 110 s job timeout and the route's 120 s socket
+DEFAULT_DEADLINE = float(os.environ.get("GEMINI_REQUEST_DEADLINE", 50))
+DEFAULT_CONCURRENCY = int(os.environ.get("GEMINI_CONCURRENCY", 4))
+DEFAULT_REQUESTS_PER_MINUTE = float(os.environ.get("GEMINI_REQUESTS_PER_MINUTE", 60))
+
+
+def backoff_delay(attempt, base=1.0, cap=30.0, retry_after=None):
+    """Exponential backoff with full jitter, honouring a server Retry-After when given."""
+    if retry_after:
+        try:
+            return min(float(retry_after), cap)
+        except ValueError:
+            pass
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+_sync_session = None
+
+
+def get_sync_session():
+    """Shared requests session with connection pooling; post_generate_content does the retries."""
+    global _sync_session
+    if _sync_session is None:
+        _sync_session = requests.Session()
+        _sync_session.mount("https://", HTTPAdapter(pool_maxsize=DEFAULT_CONCURRENCY))
+        _sync_session.mount("http://", HTTPAdapter(pool_maxsize=DEFAULT_CONCURRENCY))
+    return _sync_session
+
+
+def post_generate_content(api_key, payload, url=None, timeout=DEFAULT_TIMEOUT, deadline=DEFAULT_DEADLINE):
+    """POST a generateContent request through the pooled session. Returns (status, body text).
+
+    429/5xx replies and connection errors are retried with backoff, but no attempt starts
+    or runs past deadline seconds from the first; the last reply (or error) is then returned.
+    """
+    give_up_at = time.monotonic() + deadline
+    for attempt in range(DEFAULT_MAX_RETRIES + 1):
+        error = None
+        try:
+            response = get_sync_session().post(
+                url or GEMINI_API_URL,
+                headers={"Content-Type": "application/json", "x-goog-api-key": api_key},
+                json=payload,
+                timeout=max(0.1, min(timeout, give_up_at - time.monotonic()))
+            )
+        except (requests.ConnectionError, requests.Timeout) as e:
+            error = e
+            retry_after = None
+        else:
+            if response.status_code not in RETRYABLE_STATUSES:
+                return response.status_code, response.text
+            retry_after = response.headers.get("Retry-After")
+
+        delay = backoff_delay(attempt, retry_after=retry_after)
+        # Retry only if the next attempt would still get a useful share of the deadline
+        if attempt == DEFAULT_MAX_RETRIES or time.monotonic() + delay + 1 >= give_up_at:
+            if error is not None:
+                raise error
+            return response.status_code, response.text
+        time.sleep(delay)
+
+
+class TokenBucket:
+    """Async token bucket: allows bursts up to capacity, refilling at rate tokens per second."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncGeminiClient:
+    """Concurrent Gemini client over one pooled aiohttp session.
+
+    Requests are limited by a semaphore (concurrency) and a token bucket
+    (requests_per_minute), time out individually, and are retried with
+    exponential backoff on 429/5xx and connection errors.
+    """
+
+    def __init__(self, api_key, url=None, concurrency=DEFAULT_CONCURRENCY,
+                 requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, timeout=DEFAULT_TIMEOUT,
+                 max_retries=DEFAULT_MAX_RETRIES):
+        self.api_key = api_key
+        self.url = url or GEMINI_API_URL
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.bucket = TokenBucket(requests_per_minute / 60.0, capacity=concurrency)
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._session = None
+
+    async def __aenter__(self):
+        import aiohttp
+
+        self._aiohttp = aiohttp
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.concurrency),
+            headers={"Content-Type": "application/json", "x-goog-api-key": self.api_key}
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self._session.close()
+
+    async def generate(self, payload):
+        """Send one generateContent payload and return the decoded JSON response, or None."""
+        aiohttp = self._aiohttp
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                await self.bucket.acquire()
+                retry_after = None
+                try:
+                    async with self._session.post(
+                        self.url, json=payload, timeout=aiohttp.ClientTimeout(total=self.timeout)
+                    ) as response:
+                        if response.status == 200:
+                            return await response.json(content_type=None)
+                        body = await response.text()
+                        if response.status not in RETRYABLE_STATUSES:
+                            print(f"Error from Gemini API: {response.status} - {body}", file=sys.stderr)
+                            return None
+                        retry_after = response.headers.get("Retry-After")
+                        error = f"HTTP {response.status}"
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    error = str(e) or type(e).__name__
+
+                if attempt == self.max_retries:
+                    print(f"Gemini request failed after {attempt + 1} attempts: {error}", file=sys.stderr)
+                    return None
+                await asyncio.sleep(backoff_delay(attempt, retry_after=retry_after))
@@ -0,0 +1,175 @@
+import json
+
+# Expected shape of each candidate field in an LLM reply
+EDUCATION_LEVELS = ("tenth", "twelfth")
+EDUCATION_FIELDS = ("school", "year", "percentage")
+STRING_FIELDS = ("name", "email", "phone", "experience")
+
+_CLOSERS = {'{': '}', '[': ']'}
+
+
+def repair_json_object(text):
+    """Find the first JSON object in text and repair common LLM defects in one pass.
+
+    Drops trailing commas and ignores code fences and chatter around the object.
+    If the reply was cut off, drops the last incomplete element and closes the
+    containers that are still open. Returns (json_text, truncated_key),
+    where truncated_key is the top-level key whose value was cut off, or None.
+    Raises ValueError if there is no object at all.
+    """
+    start = text.find('{')
+    if start < 0:
+        raise ValueError("No JSON object in response")
+
+    out = []
+    stack = []
+    # (output length, open containers) at each point where the object can be cut and closed
+    cut_points = []
+    in_string = escaped = False
+    string_start = 0
+    last_string = None
+    top_key = None
+
+    for position in range(start, len(text)):
+        char = text[position]
+        if in_string:
+            out.append(char)
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+                last_string = text[string_start:position]
+            continue
+
+        if char == '"':
+            in_string = True
+            string_start = position + 1
+            out.append(char)
+        elif char in '{[':
+            stack.append(char)
+            out.append(char)
+            cut_points.append((len(out), tuple(stack)))
+        elif char in '}]':
+            while out and out[-1].isspace():
+                out.pop()
+            if out and out[-1] == ',':
+                out.pop()
+            if not stack or _CLOSERS[stack[-1]] != char:
+                raise ValueError(f"Unbalanced '{char}' in JSON reply")
+            stack.pop()
+            out.append(char)
+            if not stack:
+                return ''.join(out), None
+        elif char == ',':
+            cut_points.append((len(out), tuple(stack)))
+            out.append(char)
+            if len(stack) == 1:
+                # The previous top-level value is complete
+                top_key = None
+        elif char == ':':
+            if len(stack) == 1 and last_string is not None:
+                top_key = last_string
+            out.append(char)
+        else:
+            out.append(char)
+
+    # The reply ended inside the object. A cut-off string or number can't be trusted,
+    # so drop the incomplete element and close the containers around it; keep the
+    # tail only if it ends with a container that was closed.
+    candidates = cut_points[::-1]
+    if ''.join(out).rstrip().endswith(('}', ']')):
+        candidates.insert(0, (len(out), tuple(stack)))
+        if len(stack) == 1:
+            # Only the outer object is open, so the last top-level value is whole
+            top_key = None
+    for length, open_containers in candidates:
+        body = ''.join(out[:length]).rstrip()
+        if body.endswith(','):
+            body = body[:-1]
+        repaired = body + ''.join(_CLOSERS[opener] for opener in reversed(open_containers))
+        try:
+            json.loads(repaired, strict=False)
+        except ValueError:
+            continue
+        return repaired, top_key
+    raise ValueError("Truncated JSON reply could not be repaired")
+
+
+def _as_text(value):
+    if value is None:
+        return ""
+    if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+        return str(value).strip()
+    return None
+
+
+def _coerce_skills(value):
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [skill.strip() for skill in value.split(',') if skill.strip()]
+    if isinstance(value, list):
+        skills = [_as_text(skill) for skill in value]
+        return [skill for skill in skills if skill]
+    return None
+
+
+def _coerce_education(value):
+    if value is None:
+        value = {}
+    if not isinstance(value, dict):
+        return None
+    education = {}
+    for level in EDUCATION_LEVELS:
+        details = value.get(level) or {}
+        if not isinstance(details, dict):
+            return None
+        education[level] = {field: _as_text(details.get(field)) or "" for field in EDUCATION_FIELDS}
+    return education
+
+
+def validate_candidate(data, fields):
+    """Coerce the requested fields of a decoded reply to the candidate schema.
+
+    Returns (cleaned data, fields that are absent or have an unusable type).
+    Nulls become empty values rather than missing ones: they mean the model
+    looked and found nothing, and asking again would not help.
+    """
+    if not isinstance(data, dict):
+        return {}, list(fields)
+
+    cleaned = dict(data)
+    missing = []
+    for field in fields:
+        if field not in data:
+            missing.append(field)
+            continue
+        if field in STRING_FIELDS:
+            value = _as_text(data[field])
+        elif field == "skills":
+            value = _coerce_skills(data[field])
+        elif field == "education":
+            value = _coerce_education(data[field])
+        else:
+            value = data[field]
+        if value is None:
+            del cleaned[field]
+            missing.append(field)
+        else:
+            cleaned[field] = value
+    return cleaned, missing
+
+
+def decode_candidate_json(text, fields):
+    """Decode an LLM reply into candidate fields.
+
+    Returns (data, missing, partial): missing fields are absent or invalid, and
+    partial fields were cut off mid-value (their repaired value is kept in data).
+    Raises ValueError if no JSON object can be recovered.
+    """
+    repaired, truncated_key = repair_json_object(text)
+    data, missing = validate_candidate(json.loads(repaired, strict=False), fields)
+    partial = [truncated_key] if truncated_key in fields and truncated_key not in missing else []
+    return data, missing, partial
@@ -0,0 +1,84 @@
+from difflib import SequenceMatcher
+
+import numpy as np
+
+# Max points the skill component contributes to the match score
+MAX_SKILL_SCORE = 60
+
+
+class RequirementScorer:
+    """Score candidate skills against one job's requirement list.
+
+    A skill's similarity to a requirement is SequenceMatcher.ratio(), or 1 when one
+    contains the other, exactly as match scores have always been computed, so new
+    scores stay comparable with stored ones. Each distinct skill string is compared
+    with every requirement once and its row is memoized; ranking many candidates for
+    the same job then reduces to gathering rows and a segmented max in NumPy, and
+    only skills not seen before cost any string matching. Blank requirements and
+    skills are kept, as they always were: an empty string is a substring of
+    anything, so it counts as a full match.
+    """
+
+    def __init__(self, requirements):
+        self.requirements = [str(req).lower() for req in requirements]
+        self._skill_rows = {}
+
+    def _compute_rows(self, skills):
+        """Similarity of each skill to each requirement, as a (skills x requirements) matrix."""
+        similarities = np.zeros((len(skills), len(self.requirements)), dtype=np.float64)
+        matcher = SequenceMatcher(None)
+        for row, skill in enumerate(skills):
+            # SequenceMatcher caches what it learns about its second sequence, so set the skill once
+            matcher.set_seq2(skill)
+            for column, req in enumerate(self.requirements):
+                if req in skill or skill in req:
+                    similarities[row, column] = 1.0
+                else:
+                    matcher.set_seq1(req)
+                    similarities[row, column] = matcher.ratio()
+        return similarities
+
+    def _ensure_rows(self, skills):
+        """Compute and memoize similarity rows for skills not seen before."""
+        missing = [skill for skill in dict.fromkeys(skills) if skill not in self._skill_rows]
+        if missing:
+            for skill, row in zip(missing, self._compute_rows(missing)):
+                self._skill_rows[skill] = row
+
+    def skill_score(self, skills):
+        """Skill component (0-60) of the match score for one candidate."""
+        return int(self.score_candidates([skills])[0])
+
+    def score_candidates(self, skill_lists, chunk_size=10000):
+        """Skill components (0-60) for many candidates against this job in one pass."""
+        scores = np.zeros(len(skill_lists), dtype=np.int64)
+        if not self.requirements:
+            return scores
+
+        for start in range(0, len(skill_lists), chunk_size):
+            chunk = [
+                [str(skill).lower() for skill in skills] if isinstance(skills, (list, tuple)) else []
+                for skills in skill_lists[start:start + chunk_size]
+            ]
+            flat = [skill for skills in chunk for skill in skills]
+            if not flat:
+                continue
+
+            # Resolve every distinct skill in the chunk, then gather rows by index
+            self._ensure_rows(flat)
+            unique = list(dict.fromkeys(flat))
+            positions = {skill: index for index, skill in enumerate(unique)}
+            unique_rows = np.stack([self._skill_rows[skill] for skill in unique])
+            rows = unique_rows[np.fromiter((positions[skill] for skill in flat), dtype=np.int64, count=len(flat))]
+
+            # Best match per requirement for each candidate, via a segmented max over their skill rows
+            counts = np.array([len(skills) for skills in chunk], dtype=np.int64)
+            has_skills = counts > 0
+            offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))[has_skills]
+            best = np.maximum.reduceat(rows, offsets, axis=0)
+            # Summed requirement by requirement, in the same order (and rounding) as the scalar loop
+            matched = np.zeros(len(best), dtype=np.float64)
+            for column in range(best.shape[1]):
+                matched += best[:, column]
+            scores[start:start + len(chunk)][has_skills] = (matched / len(self.requirements) * MAX_SKILL_SCORE).astype(np.int64)
+        return scores
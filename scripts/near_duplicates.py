@@ -0,0 +1,180 @@
+import hashlib
+import json
+import random
+import re
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+
+import numpy as np
+
+# Words per shingle; five-word shingles survive reflowed lines and small edits
+DEFAULT_SHINGLE_SIZE = 5
+# 16 bands of 8 rows make pairs above ~0.7 Jaccard very likely to share a bucket
+DEFAULT_NUM_PERM = 128
+DEFAULT_BANDS = 16
+# Estimated Jaccard similarity above which an upload reuses the earlier parse
+DEFAULT_THRESHOLD = 0.9
+# Fixed so signatures stay comparable across processes and restarts
+DEFAULT_SEED = 1
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+_WORD_PATTERN = re.compile(r'[a-z0-9]+(?:[.+#@-][a-z0-9]+)*')
+
+
+def text_shingles(text, size=DEFAULT_SHINGLE_SIZE):
+    """32-bit hashes of the overlapping word n-grams of text, ignoring case and punctuation."""
+    words = _WORD_PATTERN.findall(text.lower())
+    if len(words) < size:
+        return {zlib.crc32(' '.join(words).encode('utf-8'))} if words else set()
+    return {zlib.crc32(' '.join(words[i:i + size]).encode('utf-8')) for i in range(len(words) - size + 1)}
+
+
+class MinHasher:
+    """MinHash signatures from universal hash permutations (a*x + b) mod p, computed with numpy."""
+
+    def __init__(self, num_perm=DEFAULT_NUM_PERM, seed=DEFAULT_SEED):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        # a < 2**31 keeps a*x + b below 2**64 for 32-bit shingle hashes
+        self.a = np.array([rng.randrange(1, 1 << 31) for _ in range(num_perm)], dtype=np.uint64)
+        self.b = np.array([rng.randrange(0, 1 << 31) for _ in range(num_perm)], dtype=np.uint64)
+
+    def signature(self, shingles):
+        """Signature of a shingle set as a uint32 array, or None for an empty set."""
+        if not shingles:
+            return None
+        values = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+        hashed = (values[:, None] * self.a[None, :] + self.b[None, :]) % _MERSENNE_PRIME & _MAX_HASH
+        return hashed.min(axis=0).astype(np.uint32)
+
+
+def estimate_similarity(first, second):
+    """Estimated Jaccard similarity of two documents from their signatures."""
+    return float(np.count_nonzero(first == second)) / len(first)
+
+
+class DuplicateIndex:
+    """Persistent MinHash LSH index of resume texts and the parse results they produced.
+
+    Each signature is cut into bands and every band is hashed into one bucket key,
+    so a lookup is a single indexed query for the documents sharing any bucket,
+    followed by a signature comparison with just those candidates. Results are
+    stored unscored, with the version string of the extractor that produced them,
+    and are only returned to lookups asking for that same version.
+    """
+
+    def __init__(self, db_path, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM, bands=DEFAULT_BANDS,
+                 shingle_size=DEFAULT_SHINGLE_SIZE, seed=DEFAULT_SEED):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.db_path = db_path
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.hasher = MinHasher(num_perm, seed)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            "doc_id TEXT PRIMARY KEY, signature BLOB NOT NULL, version TEXT NOT NULL, "
+            "result TEXT NOT NULL, created REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS buckets (bucket INTEGER NOT NULL, doc_id TEXT NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS buckets_bucket ON buckets(bucket)")
+        self._check_settings({"num_perm": num_perm, "bands": bands, "shingle_size": shingle_size, "seed": seed})
+        self._conn.commit()
+
+    def _check_settings(self, settings):
+        """Signatures built with other parameters can't be compared, so refuse to mix them."""
+        stored = dict(self._conn.execute("SELECT name, value FROM settings").fetchall())
+        if not stored:
+            self._conn.executemany("INSERT INTO settings (name, value) VALUES (?, ?)",
+                                   [(name, str(value)) for name, value in settings.items()])
+            return
+        for name, value in settings.items():
+            if stored.get(name) != str(value):
+                raise ValueError(f"{self.db_path} was built with {name}={stored.get(name)}, not {value}")
+
+    def signature(self, text):
+        return self.hasher.signature(text_shingles(text, self.shingle_size))
+
+    def _bucket_keys(self, signature):
+        # The band number is hashed in so equal rows in different bands don't collide
+        keys = []
+        for band in range(self.bands):
+            rows = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            digest = hashlib.blake2b(rows, digest_size=8, key=band.to_bytes(2, 'big')).digest()
+            keys.append(int.from_bytes(digest, 'big', signed=True))
+        return keys
+
+    def lookup(self, signature, version):
+        """Best indexed match at or above the threshold, as (doc_id, similarity, result), or None."""
+        if signature is None:
+            return None
+        keys = self._bucket_keys(signature)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT doc_id, signature, result FROM documents WHERE version = ? AND doc_id IN "
+                f"(SELECT doc_id FROM buckets WHERE bucket IN ({','.join('?' * len(keys))}))",
+                [version] + keys
+            ).fetchall()
+
+        best = None
+        for doc_id, stored, result in rows:
+            similarity = estimate_similarity(signature, np.frombuffer(stored, dtype=np.uint32))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (doc_id, similarity, result)
+        if best is None:
+            return None
+        return best[0], best[1], json.loads(best[2])
+
+    def add(self, doc_id, signature, version, result):
+        """Index a document's signature with the unscored result parsed from it."""
+        if signature is None:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM buckets WHERE doc_id = ?", (doc_id,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO documents (doc_id, signature, version, result, created) VALUES (?, ?, ?, ?, ?)",
+                (doc_id, signature.tobytes(), version, json.dumps(result), time.time())
+            )
+            self._conn.executemany(
+                "INSERT INTO buckets (bucket, doc_id) VALUES (?, ?)",
+                [(key, doc_id) for key in self._bucket_keys(signature)]
+            )
+            self._conn.commit()
+
+    def stats(self):
+        with self._lock:
+            documents = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+        return {"documents": documents, "bands": self.bands, "rows": self.rows, "threshold": self.threshold}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Example usage
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or clear the near-duplicate resume index")
+    parser.add_argument("db_path", help="Path to the index database")
+    parser.add_argument("--clear", action="store_true", help="Delete all indexed documents")
+    args = parser.parse_args()
+
+    index = DuplicateIndex(args.db_path)
+    if args.clear:
+        index._conn.execute("DELETE FROM buckets")
+        index._conn.execute("DELETE FROM documents")
+        index._conn.commit()
+        print("Index cleared", file=sys.stderr)
+    print(json.dumps(index.stats(), indent=2))
+    index.close()
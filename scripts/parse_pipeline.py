@@ -0,0 +1,580 @@
+import json
+import multiprocessing
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from parser_metrics import PIPELINE_QUEUE_DEPTH, PIPELINE_REJECTIONS, PIPELINE_WAIT_SECONDS, REGEX_FALLBACKS
+from resume_parser_gemini import (
+    GEMINI_PROMPT_VERSION, build_parse_artifact, extract_regex_fields, extract_resume_fields_with_gemini,
+    fill_uncertain_fields, finalize_candidate, has_resume_text, hybrid_result_version, parse_budget,
+    parse_result_version, read_resume, regex_fallback_reason, regex_result_version, remember_parse,
+    rescore_from_artifact, uncertain_fields
+)
+from resume_sections import segment_sections
+from stage_profiler import new_profile, profiling
+
+# Stages in the order a job moves through them; a job may skip ahead but never goes back
+STAGES = ("read", "regex", "llm", "score")
+# read: cache, PDF decode and dedupe; llm threads mostly wait on the network, so it gets the most
+DEFAULT_STAGE_WORKERS = {"read": 2, "regex": 2, "llm": 8, "score": 1}
+# Jobs allowed to wait in front of each stage before the stage feeding it blocks
+STAGE_QUEUE_SIZE = int(os.environ.get("RESUME_PIPELINE_QUEUE_SIZE") or 8)
+# Queued jobs in the job database before new submissions are turned away
+MAX_QUEUED_JOBS = int(os.environ.get("RESUME_PIPELINE_MAX_QUEUED") or 256)
+# How often the feeder checks the job database for jobs submitted by other processes
+POLL_INTERVAL = 0.5
+# Seconds a socket client waits for its job; below the API route's 120s socket timeout
+JOB_TIMEOUT = float(os.environ.get("RESUME_PIPELINE_JOB_TIMEOUT") or 110)
+
+
+def parse_stage_workers(spec):
+    """Per-stage worker counts from a spec like "read=4,llm=16"; unnamed stages keep their default."""
+    workers = dict(DEFAULT_STAGE_WORKERS)
+    for part in (spec or "").split(','):
+        if not part.strip():
+            continue
+        name, _, count = part.partition('=')
+        name = name.strip()
+        if name not in workers:
+            raise ValueError(f"Unknown pipeline stage '{name}' (choose from {', '.join(STAGES)})")
+        try:
+            workers[name] = int(count)
+        except ValueError:
+            raise ValueError(f"Worker count for stage '{name}' must be an integer, got '{count}'") from None
+        if workers[name] < 1:
+            raise ValueError(f"Stage '{name}' needs at least one worker")
+    return workers
+
+
+class JobQueue:
+    """Durable SQLite queue of parse jobs and their responses.
+
+    Jobs move from queued to running when a pipeline claims them and to done or
+    failed once answered. Several processes may submit to the same file, but only
+    one pipeline should consume it: on start-up it puts jobs left running by a
+    crash back in the queue. Submissions are refused once max_queued jobs wait.
+    """
+
+    def __init__(self, db_path, max_queued=MAX_QUEUED_JOBS):
+        self.db_path = db_path
+        self.max_queued = max_queued
+        self._lock = threading.Lock()
+        # Autocommit, so claims can take the write lock up front with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, job TEXT NOT NULL, state TEXT NOT NULL, "
+            "response TEXT, created REAL NOT NULL, updated REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs(state, id)")
+
+    def submit(self, job):
+        """Queue a job and return its queue ID, or None if the queue is full."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                queued = self._conn.execute("SELECT COUNT(*) FROM jobs WHERE state = 'queued'").fetchone()[0]
+                if queued >= self.max_queued:
+                    return None
+                cursor = self._conn.execute(
+                    "INSERT INTO jobs (job, state, created, updated) VALUES (?, 'queued', ?, ?)",
+                    (json.dumps(job), now, now)
+                )
+                return cursor.lastrowid
+            finally:
+                self._conn.execute("COMMIT")
+
+    def claim(self):
+        """Mark the oldest queued job running and return (queue ID, job), or None if none wait."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT id, job FROM jobs WHERE state = 'queued' ORDER BY id LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    return None
+                self._conn.execute("UPDATE jobs SET state = 'running', updated = ? WHERE id = ?", (time.time(), row[0]))
+                return row[0], json.loads(row[1])
+            finally:
+                self._conn.execute("COMMIT")
+
+    def finish(self, queue_id, response):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET state = ?, response = ?, updated = ? WHERE id = ?",
+                ("done" if response.get("ok") else "failed", json.dumps(response), time.time(), queue_id)
+            )
+
+    def result(self, queue_id):
+        """(state, response) of a job; response is None until it finishes. None for unknown IDs."""
+        with self._lock:
+            row = self._conn.execute("SELECT state, response FROM jobs WHERE id = ?", (queue_id,)).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1]) if row[1] else None
+
+    def forget(self, queue_id):
+        with self._lock:
+            self._conn.execute("DELETE FROM jobs WHERE id = ?", (queue_id,))
+
+    def withdraw(self, queue_id):
+        """Delete a job that hasn't been claimed yet. Returns False if it is already running or done."""
+        with self._lock:
+            return self._conn.execute("DELETE FROM jobs WHERE id = ? AND state = 'queued'", (queue_id,)).rowcount > 0
+
+    def recover(self):
+        """Requeue jobs a previous pipeline claimed but never answered. Returns how many."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET state = 'queued', updated = ? WHERE state = 'running'", (time.time(),)
+            )
+            return cursor.rowcount
+
+    def purge(self, older_than=0):
+        """Delete finished jobs last updated more than older_than seconds ago. Returns how many."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE state IN ('done', 'failed') AND updated <= ?", (time.time() - older_than,)
+            )
+            return cursor.rowcount
+
+    def queued(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs WHERE state = 'queued'").fetchone()[0]
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall())
+        return {state: counts.get(state, 0) for state in ("queued", "running", "done", "failed")}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ParsePipeline:
+    """Parse jobs from a JobQueue through bounded per-stage queues and worker pools.
+
+    A job is read (cache, PDF text, near-duplicate lookup), run through the regex
+    extractors, sent to Gemini and finally scored, each stage on its own threads.
+    Stages skip what a job doesn't need: cache and dedupe hits go straight to
+    scoring, full-mode LLM jobs skip the regex stage and regex-only jobs skip
+    the LLM. Every stage queue holds at most queue_size jobs, so a slow stage
+    blocks the one before it and, in the end, the feeder claiming jobs from the
+    database; the backlog waits on disk rather than in memory. With processes
+    set, PDF decoding runs on a process pool so it can use more than one core
+    while the LLM threads wait on the network.
+    """
+
+    def __init__(self, job_queue, api_key=None, cache=None, mode="full", duplicates=None, workers=None,
+                 queue_size=STAGE_QUEUE_SIZE, processes=0, on_result=None, job_timeout=JOB_TIMEOUT):
+        self.job_queue = job_queue
+        self.api_key = api_key
+        self.cache = cache
+        self.mode = mode
+        self.duplicates = duplicates
+        self.workers = dict(DEFAULT_STAGE_WORKERS, **(workers or {}))
+        self.on_result = on_result
+        self.job_timeout = job_timeout
+        self._queues = {name: queue.Queue(maxsize=queue_size) for name in STAGES}
+        self._handlers = {"read": self._read, "regex": self._regex, "llm": self._llm, "score": self._score}
+        # Spawned, not forked: forking a process that already runs threads can deadlock the child
+        self._executor = ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("spawn")) if processes else None
+        self._stopping = threading.Event()
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._waiters = {}
+        # Jobs whose client gave up; their rows are deleted instead of answered
+        self._abandoned = set()
+        # Per-job API keys stay in memory; the job database never stores them
+        self._api_keys = {}
+        self._in_flight = 0
+        self._threads = []
+
+    def start(self):
+        recovered = self.job_queue.recover()
+        if recovered:
+            print(f"Requeued {recovered} pipeline jobs left running by a previous worker", file=sys.stderr)
+        self._threads.append(threading.Thread(target=self._feed, name="pipeline-feed", daemon=True))
+        for name in STAGES:
+            for number in range(self.workers[name]):
+                self._threads.append(threading.Thread(
+                    target=self._work, args=(name,), name=f"pipeline-{name}-{number}", daemon=True
+                ))
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def submit(self, job):
+        """Queue a job; returns its queue ID, or None if the job queue is full."""
+        return self._submit(job)
+
+    def _submit(self, job, waiter=None):
+        api_key = job.pop("api_key", None)
+        with self._lock:
+            # The waiter is registered before the lock is released, so the job can't finish unseen
+            queue_id = self.job_queue.submit(job)
+            if queue_id is not None:
+                if api_key:
+                    self._api_keys[queue_id] = api_key
+                if waiter:
+                    self._waiters[queue_id] = waiter
+        if queue_id is None:
+            PIPELINE_REJECTIONS.inc()
+        else:
+            self._wakeup.set()
+        return queue_id
+
+    def run_job(self, job, timeout=None):
+        """Submit a worker-protocol job and block until its response is ready, or for at most
+        timeout seconds (the pipeline's job_timeout by default)."""
+        job_id = job.get("id") if isinstance(job, dict) else None
+        if not isinstance(job, dict) or not (job.get("pdf_path") or job.get("artifact")):
+            return {"id": job_id, "ok": False, "error": "Job is missing pdf_path or artifact"}
+
+        done = threading.Event()
+        queue_id = self._submit(job, [done, None])
+        if queue_id is None:
+            return {"id": job_id, "ok": False, "error": "Parse queue is full; retry later", "retry": True}
+
+        done.wait(self.job_timeout if timeout is None else timeout)
+        with self._lock:
+            # Checked under the lock, so a job finishing right at the deadline is still delivered
+            response = self._waiters.pop(queue_id)[1]
+            if response is None:
+                self._api_keys.pop(queue_id, None)
+                if not self.job_queue.withdraw(queue_id):
+                    self._abandoned.add(queue_id)
+        if response is None:
+            return {"id": job_id, "ok": False, "error": "Timed out waiting for the parse pipeline"}
+        self.job_queue.forget(queue_id)
+        return response
+
+    def drain(self):
+        """Block until the job queue is empty and every claimed job has been answered."""
+        while True:
+            with self._lock:
+                idle = self._in_flight == 0
+            if idle and not self.job_queue.queued():
+                return
+            time.sleep(0.05)
+
+    def close(self):
+        """Stop the workers. Jobs still in flight stay running in the database and are requeued next start."""
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout=1)
+        if self._executor:
+            self._executor.shutdown(cancel_futures=True)
+
+    def stats(self):
+        return {
+            "queue": self.job_queue.stats(),
+            "stages": {name: self._queues[name].qsize() for name in STAGES},
+            "workers": self.workers,
+            "in_flight": self._in_flight
+        }
+
+    def _feed(self):
+        while not self._stopping.is_set():
+            with self._lock:
+                # Counted in flight as it leaves the queue, so drain() can't miss it between the two
+                claimed = self.job_queue.claim()
+                if claimed is not None:
+                    self._in_flight += 1
+                    api_key = self._api_keys.pop(claimed[0], None) or self.api_key
+            PIPELINE_QUEUE_DEPTH.set(self.job_queue.queued(), stage="backlog")
+            if claimed is None:
+                self._wakeup.wait(POLL_INTERVAL)
+                self._wakeup.clear()
+                continue
+            queue_id, job = claimed
+            self._put("read", self._new_task(queue_id, job, api_key))
+
+    def _new_task(self, queue_id, job, api_key):
+        job_reqs = job.get("job_requirements")
+        if isinstance(job_reqs, str):
+            job_reqs = [req.strip() for req in job_reqs.split(',') if req.strip()]
+        pdf_path = job.get("pdf_path")
+        mode = job.get("mode") or self.mode
+        budget = parse_budget(job.get("max_pages"), job.get("max_chars"))
+        return {
+            "queue_id": queue_id,
+            "job": job,
+            "filename": job.get("filename") or (os.path.basename(pdf_path) if pdf_path else ""),
+            "job_requirements": job_reqs,
+            "api_key": api_key,
+            "mode": mode,
+            "budget": budget,
+            "result_version": parse_result_version(api_key, mode, budget),
+            "with_artifact": bool(job.get("return_artifact")),
+            "sections": None,
+            "reused": False,
+            # Jobs can ask for a profile; otherwise RESUME_PROFILE_SAMPLE_RATE decides
+            "profile": new_profile(force=bool(job.get("profile")))
+        }
+
+    def _put(self, name, task):
+        """Hand a task to a stage, blocking while its queue is full. Returns False when stopping."""
+        task["enqueued"] = time.perf_counter()
+        PIPELINE_QUEUE_DEPTH.inc(stage=name)
+        while True:
+            try:
+                self._queues[name].put(task, timeout=POLL_INTERVAL)
+                return True
+            except queue.Full:
+                if self._stopping.is_set():
+                    PIPELINE_QUEUE_DEPTH.dec(stage=name)
+                    return False
+
+    def _work(self, name):
+        stage_queue = self._queues[name]
+        handler = self._handlers[name]
+        while not self._stopping.is_set():
+            try:
+                task = stage_queue.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            PIPELINE_QUEUE_DEPTH.dec(stage=name)
+            PIPELINE_WAIT_SECONDS.observe(time.perf_counter() - task["enqueued"], stage=name)
+            if task["queue_id"] in self._abandoned:
+                # Nobody is waiting for the result; don't spend a PDF decode or Gemini call on it
+                self._finish(task, {"id": task["job"].get("id"), "ok": False, "error": "Abandoned"})
+                continue
+            try:
+                with profiling(task["profile"]):
+                    next_stage = handler(task)
+            except Exception as e:
+                print(f"Error in pipeline stage {name} for job {task['queue_id']}: {e}", file=sys.stderr)
+                self._finish(task, {"id": task["job"].get("id"), "ok": False, "error": str(e)})
+                continue
+            if next_stage:
+                self._put(next_stage, task)
+
+    def _finish(self, task, response):
+        queue_id = task["queue_id"]
+        if task["profile"]:
+            timings = task["profile"].finish()
+            if response.get("ok"):
+                response["timings"] = timings
+        with self._lock:
+            self._in_flight -= 1
+            abandoned = queue_id in self._abandoned
+            self._abandoned.discard(queue_id)
+            if abandoned:
+                self.job_queue.forget(queue_id)
+            else:
+                self.job_queue.finish(queue_id, response)
+            waiter = self._waiters.get(queue_id)
+            if waiter:
+                waiter[1] = response
+                waiter[0].set()
+        if self.on_result:
+            self.on_result(queue_id, response)
+
+    def _read(self, task):
+        job = task["job"]
+        if job.get("artifact"):
+            # Rescoring may still need the LLM if the stored fields are stale
+            return "llm"
+        loaded = read_resume(
+            job["pdf_path"], task["result_version"], task["budget"], self.cache, job.get("max_pages"),
+            job.get("max_chars"), self.duplicates, task["with_artifact"], self._executor
+        )
+        task["loaded"] = loaded
+        if loaded["result"] is not None:
+            task["fields"] = loaded["result"]
+            task["fields_version"] = task["result_version"]
+            task["reused"] = True
+            return "score"
+        if task["api_key"] and task["mode"] != "hybrid" and has_resume_text(loaded["text"]):
+            return "llm"
+        return "regex"
+
+    def _regex(self, task):
+        text = task["loaded"]["text"]
+        # A PDF without text (failed extraction, rejected OCR) isn't worth a Gemini call
+        with_llm = bool(task["api_key"]) and has_resume_text(text)
+        sections = segment_sections(text)
+        task["sections"] = sections
+        task["fields"] = extract_regex_fields(text, task["filename"], sections=sections)
+        if not with_llm:
+            print("Falling back to traditional parsing", file=sys.stderr)
+            REGEX_FALLBACKS.inc(reason=regex_fallback_reason(task["api_key"], text))
+            task["fields_version"] = regex_result_version()
+            return "score"
+
+        # Hybrid mode: only fields the regex extractors are unsure of go to the LLM
+        task["uncertain"] = uncertain_fields(task["fields"], task["filename"])
+        task["fields_version"] = hybrid_result_version()
+        return "llm" if task["uncertain"] else "score"
+
+    def _llm(self, task):
+        job = task["job"]
+        if job.get("artifact"):
+            task["result"], task["artifact"] = rescore_from_artifact(
+                job["artifact"], task["job_requirements"], task["filename"], task["api_key"], task["mode"]
+            )
+            return "score"
+
+        text = task["loaded"]["text"]
+        if task["mode"] == "hybrid":
+            if not fill_uncertain_fields(task["fields"], task["uncertain"], text, task["api_key"]):
+                task["fields_version"] = None
+            return "score"
+
+        # Unscored: the score stage attaches the match score once
+        fields = extract_resume_fields_with_gemini(task["api_key"], text, task["filename"])
+        if fields is not None:
+            task["fields"] = fields
+            task["fields_version"] = GEMINI_PROMPT_VERSION
+            return "score"
+        print("Falling back to traditional parsing", file=sys.stderr)
+        REGEX_FALLBACKS.inc(reason="llm_failed")
+        if task["with_artifact"]:
+            task["sections"] = segment_sections(text)
+        task["fields"] = extract_regex_fields(text, task["filename"], sections=task["sections"])
+        task["fields_version"] = regex_result_version()
+        return "score"
+
+    def _score(self, task):
+        job = task["job"]
+        if "result" in task:
+            result, artifact = task["result"], task["artifact"]
+        else:
+            result = finalize_candidate(task["fields"], task["job_requirements"])
+            fields_version = task["fields_version"]
+            if fields_version and not task["reused"]:
+                fields_version += task["budget"]
+                remember_parse(task["loaded"], result, fields_version, self.cache, self.duplicates)
+            artifact = None
+            if task["with_artifact"]:
+                artifact = build_parse_artifact(
+                    task["loaded"]["text"], result, fields_version, task["budget"], task["loaded"]["pdf_hash"],
+                    task["sections"]
+                )
+
+        response = {"id": job.get("id"), "ok": True, "result": result}
+        if task["with_artifact"]:
+            response["artifact"] = artifact
+        self._finish(task, response)
+
+
+# Example usage
+if __name__ == "__main__":
+    import argparse
+
+    from near_duplicates import DEFAULT_THRESHOLD, DuplicateIndex
+    from parser_metrics import STAGE_SECONDS, start_metrics_server
+    from pdf_text import PDF_BACKENDS, set_default_backend
+    from resume_cache import ParseCache
+    from resume_parser_gemini import load_env_from_file, serve_unix_socket
+    from stage_profiler import set_stage_observer
+
+    parser = argparse.ArgumentParser(description="Parse resumes through a staged pipeline fed by a SQLite job queue")
+    parser.add_argument("queue_db", help="Path to the job queue database")
+    parser.add_argument("--serve", action="store_true", help="Answer worker-protocol jobs on --socket through the pipeline")
+    parser.add_argument("--socket", help="Unix socket path for --serve")
+    parser.add_argument("--submit", nargs="+", metavar="PDF", help="Queue these PDFs and print their queue IDs")
+    parser.add_argument("--run", action="store_true", help="Parse every queued job, print each response as JSONL, then exit")
+    parser.add_argument("--result", type=int, metavar="ID", help="Print the state and response of a queued job")
+    parser.add_argument("--status", action="store_true", help="Print job counts by state")
+    parser.add_argument("--purge", action="store_true", help="Delete finished jobs")
+    parser.add_argument("--job_requirements", help="Job requirements for --submit, as a comma-separated list")
+    parser.add_argument("--api_key", help="Gemini API key (optional)")
+    parser.add_argument("--mode", choices=["full", "hybrid"], default=os.environ.get("RESUME_PARSER_MODE", "full"),
+                        help="full: send the whole resume to Gemini; hybrid: regex first, Gemini only for missing fields")
+    parser.add_argument("--stage_workers", default=os.environ.get("RESUME_PIPELINE_WORKERS", ""),
+                        help="Threads per stage, e.g. 'read=4,regex=2,llm=16,score=1' (defaults: " +
+                             ",".join(f"{name}={count}" for name, count in DEFAULT_STAGE_WORKERS.items()) + ")")
+    parser.add_argument("--stage_queue_size", type=int, default=STAGE_QUEUE_SIZE,
+                        help="Jobs allowed to wait in front of each stage before the previous stage blocks")
+    parser.add_argument("--job_timeout", type=float, default=JOB_TIMEOUT,
+                        help="Seconds a --serve client waits for its result before the job is abandoned")
+    parser.add_argument("--max_queued", type=int, default=MAX_QUEUED_JOBS,
+                        help="Queued jobs in the database before new submissions are refused")
+    parser.add_argument("--processes", type=int, default=int(os.environ.get("RESUME_PIPELINE_PROCESSES") or 0),
+                        help="Decode PDFs on a pool of this many processes (0 decodes on the read threads)")
+    parser.add_argument("--cache", default=os.environ.get("RESUME_PARSER_CACHE"), help="Path to a SQLite parse cache keyed on PDF content (optional)")
+    parser.add_argument("--cache_max_mb", type=int, default=256, help="Maximum size of the parse cache in MB")
+    parser.add_argument("--dedupe_index", default=os.environ.get("RESUME_PARSER_DEDUPE_INDEX"),
+                        help="Path to a SQLite MinHash index; near-duplicates of earlier resumes reuse their parse (optional)")
+    parser.add_argument("--dedupe_threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Estimated text similarity (0-1) above which a resume counts as a near-duplicate")
+    parser.add_argument("--pdf_backend",
+                        help=f"PDF text extractor ({', '.join(sorted(PDF_BACKENDS))}; defaults to RESUME_PDF_BACKEND or pypdf2)")
+    parser.add_argument("--metrics_port", type=int, default=int(os.environ.get("RESUME_PARSER_METRICS_PORT") or 0),
+                        help="With --serve, expose Prometheus metrics on this local port (0 disables)")
+    args = parser.parse_args()
+
+    if args.serve and not args.socket:
+        parser.error("--serve needs --socket")
+    try:
+        stage_workers = parse_stage_workers(args.stage_workers)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.pdf_backend:
+        try:
+            set_default_backend(args.pdf_backend)
+        except ValueError as e:
+            parser.error(str(e))
+        # Decoding processes pick the backend up from the environment
+        os.environ["RESUME_PDF_BACKEND"] = args.pdf_backend
+
+    job_queue = JobQueue(args.queue_db, args.max_queued)
+
+    if args.submit:
+        job_reqs = [req.strip() for req in args.job_requirements.split(',') if req.strip()] if args.job_requirements else None
+        for pdf_path in args.submit:
+            job = {"id": pdf_path, "pdf_path": os.path.abspath(pdf_path), "job_requirements": job_reqs}
+            queue_id = job_queue.submit(job)
+            if queue_id is None:
+                print(f"Job queue is full; {pdf_path} was not queued", file=sys.stderr)
+                sys.exit(1)
+            print(json.dumps({"queue_id": queue_id, "pdf_path": pdf_path}))
+    if args.result is not None:
+        status = job_queue.result(args.result)
+        if status is None:
+            print(f"No job with queue ID {args.result}", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps({"queue_id": args.result, "state": status[0], "response": status[1]}, indent=2))
+    if args.purge:
+        print(f"Deleted {job_queue.purge()} finished jobs", file=sys.stderr)
+    if args.status:
+        print(json.dumps(job_queue.stats(), indent=2))
+    if not (args.serve or args.run):
+        sys.exit(0)
+
+    api_key = args.api_key or os.environ.get('GEMINI_API_KEY') or load_env_from_file()
+    cache = ParseCache(args.cache, args.cache_max_mb * 1024 * 1024) if args.cache else None
+    duplicates = DuplicateIndex(args.dedupe_index, args.dedupe_threshold) if args.dedupe_index else None
+
+    def print_result(queue_id, response):
+        sys.stdout.write(json.dumps(dict(response, queue_id=queue_id)) + "\n")
+        sys.stdout.flush()
+
+    pipeline = ParsePipeline(
+        job_queue, api_key, cache, args.mode, duplicates, stage_workers, args.stage_queue_size, args.processes,
+        on_result=print_result if args.run else None, job_timeout=args.job_timeout
+    ).start()
+    try:
+        if args.serve:
+            if args.metrics_port:
+                set_stage_observer(lambda name, seconds: STAGE_SECONDS.observe(seconds, stage=name))
+                start_metrics_server(args.metrics_port)
+            serve_unix_socket(args.socket, api_key, cache, args.mode, duplicates, pipeline)
+        else:
+            start = time.perf_counter()
+            pipeline.drain()
+            print(f"Pipeline drained in {time.perf_counter() - start:.2f}s: {json.dumps(job_queue.stats())}", file=sys.stderr)
+    finally:
+        pipeline.close()
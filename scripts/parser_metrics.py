@@ -0,0 +1,188 @@
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Latency buckets in seconds, from fast regex stages up to slow LLM round-trips
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """A named metric family whose samples are keyed by label values."""
+
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+        if not self.labelnames and self.kind in ("counter", "gauge"):
+            # Unlabelled series exist from the start, so rates work from the first scrape
+            self._values[()] = 0
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key, value):
+        return [f"{self.name}{_format_labels(list(zip(self.labelnames, key)))} {_format_value(value)}"]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["counts"][index] += 1
+                    break
+            state["sum"] += value
+            state["count"] += 1
+
+    def _render_sample(self, key, state):
+        pairs = list(zip(self.labelnames, key))
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, state["counts"]):
+            cumulative += count
+            lines.append(f"{self.name}_bucket{_format_labels(pairs + [('le', _format_value(bound))])} {cumulative}")
+        labels = _format_labels(pairs)
+        lines.append(f"{self.name}_sum{labels} {_format_value(state['sum'])}")
+        lines.append(f"{self.name}_count{labels} {state['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        return "\n".join(line for metric in self.metrics for line in metric.render()) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+JOBS = REGISTRY.register(Counter("resume_parser_jobs_total", "Parse jobs answered by the worker.", ["outcome"]))
+JOB_SECONDS = REGISTRY.register(Histogram("resume_parser_job_seconds", "End-to-end time to answer a parse job."))
+STAGE_SECONDS = REGISTRY.register(Histogram("resume_parser_stage_seconds", "Wall time spent in each parse stage.", ["stage"]))
+QUEUE_DEPTH = REGISTRY.register(Gauge("resume_parser_queue_depth", "Parse jobs received but not yet answered."))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    "resume_parser_cache_requests_total", "Parse cache lookups by entry kind and outcome.", ["kind", "outcome"]
+))
+LLM_CALLS = REGISTRY.register(Counter(
+    "resume_parser_llm_calls_total", "Gemini requests by request kind and outcome.", ["kind", "outcome"]
+))
+REGEX_FALLBACKS = REGISTRY.register(Counter(
+    "resume_parser_regex_fallbacks_total", "Parses whose fields came from the regex extractors instead of the LLM.", ["reason"]
+))
+PDF_FAILURES = REGISTRY.register(Counter(
+    "resume_parser_pdf_failures_total", "PDFs that could not be opened or yielded no text.", ["reason"]
+))
+OCR_PAGES = REGISTRY.register(Counter(
+    "resume_parser_ocr_pages_total", "Scanned pages sent to OCR by outcome.", ["outcome"]
+))
+PROMPT_TOKENS = REGISTRY.register(Counter(
+    "resume_parser_prompt_tokens_total", "Estimated resume text tokens embedded in Gemini prompts, before and after preparation.", ["text"]
+))
+PIPELINE_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "resume_parser_pipeline_queue_depth", "Pipeline jobs waiting for each stage, or in the job queue (backlog).", ["stage"]
+))
+PIPELINE_WAIT_SECONDS = REGISTRY.register(Histogram(
+    "resume_parser_pipeline_wait_seconds", "Time pipeline jobs spend queued in front of each stage.", ["stage"]
+))
+PIPELINE_REJECTIONS = REGISTRY.register(Counter(
+    "resume_parser_pipeline_rejections_total", "Jobs turned away because the pipeline job queue was full."
+))
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?', 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would flood stderr
+        pass
+
+
+def start_metrics_server(port, host="127.0.0.1"):
+    """Serve /metrics from a daemon thread. Returns the server so callers can shut it down."""
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    print(f"Resume parser metrics on http://{host}:{server.server_address[1]}/metrics", file=sys.stderr)
+    return server
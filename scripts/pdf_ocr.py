@@ -0,0 +1,125 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from parser_metrics import OCR_PAGES
+from stage_profiler import stage
+
+# Set RESUME_OCR=0 to never OCR, e.g. on hosts without poppler-utils and tesseract
+OCR_ENABLED = os.environ.get("RESUME_OCR", "1") != "0"
+# OCR subprocesses allowed to run at once; each one keeps a core busy
+OCR_WORKERS = int(os.environ.get("RESUME_OCR_WORKERS") or max(1, (os.cpu_count() or 2) // 2))
+# Pages waiting or running before new scanned uploads are turned away
+OCR_MAX_PENDING_PAGES = int(os.environ.get("RESUME_OCR_MAX_PENDING_PAGES") or OCR_WORKERS * 8)
+# Resumes are short; later pages of a scan are rarely worth the CPU
+OCR_MAX_PAGES = int(os.environ.get("RESUME_OCR_MAX_PAGES") or 4)
+OCR_PAGE_TIMEOUT = float(os.environ.get("RESUME_OCR_PAGE_TIMEOUT") or 30)
+OCR_DOCUMENT_TIMEOUT = float(os.environ.get("RESUME_OCR_TIMEOUT") or 90)
+OCR_LANGUAGE = os.environ.get("RESUME_OCR_LANG", "eng")
+OCR_DPI = 300
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending_pages = 0
+
+
+def ocr_available():
+    """Whether OCR is enabled and the pdftoppm and tesseract binaries are on PATH."""
+    return OCR_ENABLED and bool(shutil.which("pdftoppm")) and bool(shutil.which("tesseract"))
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=OCR_WORKERS, thread_name_prefix="resume-ocr")
+        return _executor
+
+
+def _reserve(pages):
+    """Admit a document's pages to the OCR queue unless it is already full.
+    An idle queue always admits, so one long scan is never refused outright."""
+    global _pending_pages
+    with _executor_lock:
+        if _pending_pages and _pending_pages + pages > OCR_MAX_PENDING_PAGES:
+            return False
+        _pending_pages += pages
+        return True
+
+
+def _release():
+    global _pending_pages
+    with _executor_lock:
+        _pending_pages -= 1
+
+
+def ocr_page(pdf_path, page_number, deadline):
+    """Render one page (0-based) with pdftoppm and read it with tesseract, each in its own process.
+    Returns the page text, or "" on failure."""
+    # Tesseract would otherwise start a thread per core for every page
+    env = dict(os.environ, OMP_THREAD_LIMIT="1")
+    try:
+        with tempfile.TemporaryDirectory(prefix="resume-ocr-") as work_dir:
+            image_prefix = os.path.join(work_dir, "page")
+            page = str(page_number + 1)
+            subprocess.run(
+                ["pdftoppm", "-f", page, "-l", page, "-r", str(OCR_DPI), "-gray", "-png", "-singlefile",
+                 pdf_path, image_prefix],
+                check=True, capture_output=True, env=env,
+                timeout=max(0.1, min(OCR_PAGE_TIMEOUT, deadline - time.monotonic()))
+            )
+            completed = subprocess.run(
+                ["tesseract", image_prefix + ".png", "stdout", "-l", OCR_LANGUAGE],
+                check=True, capture_output=True, env=env,
+                timeout=max(0.1, min(OCR_PAGE_TIMEOUT, deadline - time.monotonic()))
+            )
+        text = completed.stdout.decode('utf-8', errors='replace')
+        OCR_PAGES.inc(outcome="ok" if text.strip() else "empty")
+        return text
+    except subprocess.TimeoutExpired:
+        print(f"OCR of page {page_number + 1} timed out", file=sys.stderr)
+        OCR_PAGES.inc(outcome="timeout")
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"Error running OCR on page {page_number + 1}: {e}", file=sys.stderr)
+        OCR_PAGES.inc(outcome="error")
+    finally:
+        _release()
+    return ""
+
+
+def ocr_pdf(pdf_path, page_numbers):
+    """OCR the given pages of a scanned PDF in parallel on the bounded OCR pool.
+
+    Returns the page texts joined in page order, or "" if OCR is unavailable,
+    the pool is saturated, or every page failed. Pages still unfinished when
+    the document deadline passes are dropped.
+    """
+    page_numbers = list(page_numbers)[:OCR_MAX_PAGES]
+    if not page_numbers:
+        return ""
+    if not ocr_available():
+        print("Skipping OCR: pdftoppm or tesseract is not installed, or RESUME_OCR=0", file=sys.stderr)
+        OCR_PAGES.inc(len(page_numbers), outcome="unavailable")
+        return ""
+    if not _reserve(len(page_numbers)):
+        print("Skipping OCR: too many scanned pages already queued", file=sys.stderr)
+        OCR_PAGES.inc(len(page_numbers), outcome="rejected")
+        return ""
+
+    deadline = time.monotonic() + OCR_DOCUMENT_TIMEOUT
+    with stage("ocr"):
+        executor = _get_executor()
+        futures = [executor.submit(ocr_page, pdf_path, page_number, deadline) for page_number in page_numbers]
+        done, not_done = wait(futures, timeout=OCR_DOCUMENT_TIMEOUT)
+        for future in not_done:
+            # Queued pages never start; running ones end at their own subprocess timeout
+            if future.cancel():
+                _release()
+                OCR_PAGES.inc(outcome="timeout")
+        texts = [future.result() for future in futures if future in done]
+    return "\n".join(text for text in texts if text.strip())
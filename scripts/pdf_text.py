@@ -0,0 +1,217 @@
+import base64
+import hashlib
+import io
+import mmap
+import os
+import sys
+
+import PyPDF2
+
+from parser_metrics import PDF_FAILURES
+from pdf_ocr import ocr_pdf
+
+try:
+    import pymupdf  # optional MuPDF-backed extractor, several times faster than PyPDF2
+except ImportError:
+    pymupdf = None
+
+DEFAULT_BACKEND = "pypdf2"
+# Backends that need an extra package, and how to get it
+OPTIONAL_BACKENDS = {"pymupdf": "pip install pymupdf"}
+# Starts every page after the first, so later stages can find page edges (tesseract does the same)
+PAGE_BREAK = "\f"
+
+
+class PdfSource:
+    """A PDF opened once and memory-mapped, shared by the reader, hasher and base64 encoder.
+
+    The mapping is handed to each consumer directly, so the upload is not read
+    into memory again for every step that needs the bytes.
+    """
+
+    def __init__(self, pdf_path):
+        self.path = pdf_path
+        self._file = open(pdf_path, 'rb')
+        try:
+            # Zero-length files can't be mapped; fall back to an empty buffer
+            if self._file.seek(0, io.SEEK_END) == 0:
+                self.buffer = io.BytesIO(b'')
+            else:
+                self.buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _view(self):
+        return self.buffer.getbuffer() if isinstance(self.buffer, io.BytesIO) else self.buffer
+
+    def reader(self):
+        self.buffer.seek(0)
+        return PyPDF2.PdfReader(self.buffer)
+
+    def sha256(self):
+        return hashlib.sha256(self._view()).hexdigest()
+
+    def base64(self):
+        return base64.b64encode(self._view()).decode('utf-8')
+
+    def close(self):
+        self.buffer.close()
+        self._file.close()
+
+
+def open_pdf_source(pdf_path):
+    """Open a PdfSource, printing the error and returning None if the file can't be read."""
+    try:
+        return PdfSource(pdf_path)
+    except OSError as e:
+        print(f"Error opening PDF: {e}", file=sys.stderr)
+        PDF_FAILURES.inc(reason="open")
+        return None
+
+
+PDF_BACKENDS = {}
+
+
+def register_backend(name, version, iter_pages):
+    """Register a text extractor. iter_pages(source, max_pages) yields the text of each
+    page of an open PdfSource. Bump version whenever the backend's output changes, since
+    it is part of the text cache key."""
+    PDF_BACKENDS[name] = (version, iter_pages)
+
+
+def _iter_pypdf2_pages(source, max_pages):
+    for page_number, page in enumerate(source.reader().pages):
+        if max_pages is not None and page_number >= max_pages:
+            break
+        yield page.extract_text() or ""
+
+
+def _iter_pymupdf_pages(source, max_pages):
+    # MuPDF reads the file itself; the path avoids copying the mapped bytes into a stream
+    with pymupdf.open(source.path) as document:
+        for page_number, page in enumerate(document):
+            if max_pages is not None and page_number >= max_pages:
+                break
+            yield page.get_text() or ""
+
+
+register_backend("pypdf2", "pypdf2-2", _iter_pypdf2_pages)
+if pymupdf is not None:
+    register_backend("pymupdf", "pymupdf-2", _iter_pymupdf_pages)
+
+
+def get_backend(name=None):
+    """(name, version, iter_pages) of a registered backend; the configured default if name is None."""
+    name = name or _default_backend
+    if name not in PDF_BACKENDS:
+        if name in OPTIONAL_BACKENDS:
+            raise ValueError(f"PDF backend {name} is not installed ({OPTIONAL_BACKENDS[name]})")
+        raise ValueError(f"Unknown PDF backend {name}; choose from {', '.join(sorted(PDF_BACKENDS))}")
+    version, iter_pages = PDF_BACKENDS[name]
+    return name, version, iter_pages
+
+
+def set_default_backend(name):
+    """Use this backend whenever extract_text_from_pdf is not given one. Raises ValueError if unavailable."""
+    global _default_backend
+    get_backend(name)
+    _default_backend = name
+
+
+def text_extractor_version(backend=None):
+    """Version of the text a backend produces, for cache keys and parse artifacts."""
+    return get_backend(backend)[1]
+
+
+_default_backend = DEFAULT_BACKEND
+try:
+    set_default_backend(os.environ.get("RESUME_PDF_BACKEND") or DEFAULT_BACKEND)
+except ValueError as e:
+    # A misconfigured worker should still parse, just more slowly
+    print(f"{e}; using {DEFAULT_BACKEND}", file=sys.stderr)
+
+
+def iter_pdf_pages(pdf, max_pages=None, backend=None):
+    """Yield the text of each page lazily, so callers can stop before decoding the rest.
+    pdf may be a path or an open PdfSource."""
+    iter_pages = get_backend(backend)[2]
+    if isinstance(pdf, PdfSource):
+        yield from iter_pages(pdf, max_pages)
+        return
+
+    with PdfSource(pdf) as source:
+        yield from iter_pages(source, max_pages)
+
+
+def _page_has_images(page):
+    """Whether a page draws any image (directly or through a form XObject)."""
+    try:
+        resources = page.get("/Resources")
+        resources = resources.get_object() if resources is not None else None
+        xobjects = resources.get("/XObject") if resources else None
+        if xobjects is None:
+            return False
+        xobjects = xobjects.get_object()
+        return any(xobjects[name].get_object().get("/Subtype") in ("/Image", "/Form") for name in xobjects)
+    except Exception:
+        return False
+
+
+def image_page_numbers(pdf, max_pages=None):
+    """0-based numbers of the pages that carry images; for a PDF without a text
+    layer these are the scanned pages worth sending to OCR."""
+    if isinstance(pdf, PdfSource):
+        pages = pdf.reader().pages
+        if max_pages is not None:
+            pages = pages[:max_pages]
+        return [number for number, page in enumerate(pages) if _page_has_images(page)]
+
+    with PdfSource(pdf) as source:
+        return image_page_numbers(source, max_pages)
+
+
+def extract_text_from_pdf(pdf, max_pages=None, max_chars=None, backend=None):
+    """Extract text from a PDF file with the given backend (PyPDF2 unless configured otherwise).
+    Stops after max_pages pages or once max_chars characters have been collected.
+    Each page after the first starts with PAGE_BREAK.
+    A PDF with no text layer but with images on its pages is treated as a scan and
+    sent to the bounded OCR pool (see pdf_ocr)."""
+    try:
+        pages = []
+        collected = 0
+        for page_text in iter_pdf_pages(pdf, max_pages, backend):
+            if not page_text:
+                continue
+            pages.append(page_text)
+            collected += len(page_text) + 1
+            if max_chars is not None and collected >= max_chars:
+                break
+
+        text = ("\n" + PAGE_BREAK).join(pages) + "\n" if pages else ""
+        if max_chars is not None:
+            text = text[:max_chars]
+
+        if not text.strip():
+            scanned_pages = image_page_numbers(pdf, max_pages)
+            if scanned_pages:
+                text = ocr_pdf(pdf.path if isinstance(pdf, PdfSource) else pdf, scanned_pages)
+                if max_chars is not None:
+                    text = text[:max_chars]
+
+        if not text.strip():
+            print("Warning: No text extracted from PDF", file=sys.stderr)
+            PDF_FAILURES.inc(reason="no_text")
+            return ""
+
+        return text
+    except Exception as e:
+        print(f"Error extracting text from PDF: {e}", file=sys.stderr)
+        PDF_FAILURES.inc(reason="error")
+        return ""
@@ -0,0 +1,122 @@
+import os
+import re
+from collections import Counter
+
+from parser_metrics import PROMPT_TOKENS
+from pdf_text import PAGE_BREAK
+from resume_sections import segment_sections
+
+# Rough chars-per-token ratio for English resume text
+CHARS_PER_TOKEN = 4
+DEFAULT_TOKEN_BUDGET = int(os.environ.get("GEMINI_PROMPT_TOKEN_BUDGET", 6000))
+
+# Sections that never feed the fields we ask the LLM for
+IRRELEVANT_SECTIONS = ("hobbies", "references", "declaration")
+
+# Lines at the top and bottom of each page searched for running headers/footers
+PAGE_EDGE_LINES = 3
+
+SPACE_RUN_PATTERN = re.compile(r'[ \t ]+')
+BLANK_LINES_PATTERN = re.compile(r'\n{3,}')
+# "Page 2", "Page 2 of 3", "2 of 3", "2/3"; bare numbers (phones, years) and dates like 06/2019 never match
+PAGE_REFERENCE_PATTERN = re.compile(
+    r'\bpage\s*\d{1,3}(?:\s*(?:of|/)\s*\d{1,3})?\b|\b\d{1,3}\s*(?:of|/)\s*\d{1,3}\b', re.IGNORECASE
+)
+EDGE_PUNCTUATION = " -\u2013\u2014|\u2022\u00b7"
+
+
+def estimate_tokens(text):
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def normalize_whitespace(text):
+    """Collapse runs of spaces and blank lines and trim each line."""
+    lines = [SPACE_RUN_PATTERN.sub(' ', line).strip() for line in text.split('\n')]
+    return BLANK_LINES_PATTERN.sub('\n\n', '\n'.join(lines)).strip()
+
+
+def _edge_key(line):
+    """A page-edge line with its page reference removed, so "Jane Roe - Page 2" matches
+    "Jane Roe - Page 3". Empty for a line that is only a page number."""
+    return PAGE_REFERENCE_PATTERN.sub('', line.lower()).strip(EDGE_PUNCTUATION)
+
+
+def strip_page_furniture(text, edge_lines=PAGE_EDGE_LINES):
+    """Drop page numbers and running headers/footers from text whose pages are separated by
+    PAGE_BREAK. Only the first and last edge_lines lines of a page are candidates: a line
+    there that matches a page reference is dropped, and one repeated at the same place on
+    most pages is kept only where it first appears."""
+    pages = [page.split('\n') for page in text.split(PAGE_BREAK)]
+    # {line index: (side, distance from that edge)} for the edge lines of each page
+    edges = []
+    for lines in pages:
+        filled = [index for index, line in enumerate(lines) if line.strip()]
+        edge = {index: ("bottom", offset) for offset, index in enumerate(reversed(filled[-edge_lines:]))}
+        edge.update({index: ("top", offset) for offset, index in enumerate(filled[:edge_lines])})
+        edges.append(edge)
+
+    # Count each key once per page, so a header is "repeated" only across pages
+    counts = Counter()
+    for lines, edge in zip(pages, edges):
+        counts.update({(position, _edge_key(lines[index])) for index, position in edge.items()})
+    running = {key for key, count in counts.items() if key[1] and count >= 2 and count * 2 > len(pages)}
+
+    kept = []
+    seen = set()
+    for lines, edge in zip(pages, edges):
+        for index, line in enumerate(lines):
+            if index in edge:
+                key = (edge[index], _edge_key(line))
+                if not key[1] and PAGE_REFERENCE_PATTERN.search(line):
+                    continue
+                if key in running:
+                    if key[1] in seen:
+                        continue
+                    seen.add(key[1])
+            kept.append(line)
+    return '\n'.join(kept)
+
+
+def drop_irrelevant_sections(text):
+    """Remove sections such as hobbies, references and declarations that the schema doesn't use."""
+    kept = []
+    position = 0
+    for name, header_start, _, content_end in segment_sections(text).sections:
+        if name in IRRELEVANT_SECTIONS:
+            kept.append(text[position:header_start])
+            position = content_end
+    kept.append(text[position:])
+    return ''.join(kept)
+
+
+def enforce_token_budget(text, max_tokens):
+    """Truncate text at a line boundary so it fits in roughly max_tokens tokens."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind('\n', 0, max_chars)
+    return text[:cut if cut > 0 else max_chars]
+
+
+def prepare_prompt_text(text, max_tokens=DEFAULT_TOKEN_BUDGET):
+    """Shrink resume text before it is embedded in an LLM prompt.
+    Returns the prepared text and a dict of before/after sizes."""
+    # Page edges are found before normalizing, which would strip the page breaks
+    prepared = normalize_whitespace(strip_page_furniture(text))
+    prepared = normalize_whitespace(drop_irrelevant_sections(prepared))
+    prepared = enforce_token_budget(prepared, max_tokens)
+
+    stats = {
+        "chars_before": len(text),
+        "chars_after": len(prepared),
+        "tokens_before": estimate_tokens(text),
+        "tokens_after": estimate_tokens(prepared)
+    }
+    return prepared, stats
+
+
+def report_prompt_reduction(stats):
+    """Count prompt tokens before and after preparation. This goes to metrics, not stderr,
+    because the API route treats any stderr output from the parser as a failure."""
+    PROMPT_TOKENS.inc(stats["tokens_before"], text="raw")
+    PROMPT_TOKENS.inc(stats["tokens_after"], text="prepared")
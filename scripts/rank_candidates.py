@@ -0,0 +1,89 @@
+import argparse
+import heapq
+import json
+import sys
+import time
+
+from candidate_record import CandidateRecord
+from resume_parser_gemini import rank_candidates
+
+
+def read_candidates(stream):
+    """Yield CandidateRecords from JSONL, accepting raw parse results or resume_batch.py records."""
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            print(f"Skipping invalid JSON on line {line_number}: {e}", file=sys.stderr)
+            continue
+
+        if "result" in record and isinstance(record["result"], dict):
+            if not record.get("ok", True):
+                continue
+            record = record["result"]
+        if not isinstance(record, dict):
+            print(f"Skipping non-object candidate on line {line_number}", file=sys.stderr)
+            continue
+        yield CandidateRecord.from_dict(record)
+
+
+def rank_stream(candidates, job_requirements, top_k=None, chunk_size=50000):
+    """Rank a stream of candidates in fixed-size chunks, keeping only a running top-K."""
+    ranked = []
+    chunk = []
+    total = 0
+
+    def flush():
+        nonlocal ranked
+        scored = rank_candidates(chunk, job_requirements, top_k)
+        if top_k is None:
+            ranked.extend(scored)
+        else:
+            ranked = heapq.nlargest(top_k, ranked + scored, key=lambda pair: pair[0])
+        chunk.clear()
+
+    for candidate in candidates:
+        chunk.append(candidate)
+        total += 1
+        if len(chunk) >= chunk_size:
+            flush()
+    if chunk:
+        flush()
+
+    if top_k is None:
+        ranked.sort(key=lambda pair: pair[0], reverse=True)
+    return ranked, total
+
+
+# Example usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-score previously parsed candidates against a job and emit a top-K ranking")
+    parser.add_argument("input", nargs="?", help="JSONL file of parsed candidates (defaults to stdin)")
+    parser.add_argument("--job_requirements", required=True, help="Job requirements as comma-separated list")
+    parser.add_argument("--top_k", type=int, default=100, help="Number of candidates to emit (0 for all)")
+    parser.add_argument("-o", "--output", help="Output JSONL file (defaults to stdout)")
+    args = parser.parse_args()
+
+    job_reqs = [req.strip() for req in args.job_requirements.split(',') if req.strip()]
+    top_k = args.top_k or None
+
+    start = time.perf_counter()
+    if args.input:
+        with open(args.input, 'r') as f:
+            ranked, total = rank_stream(read_candidates(f), job_reqs, top_k)
+    else:
+        ranked, total = rank_stream(read_candidates(sys.stdin), job_reqs, top_k)
+    elapsed = time.perf_counter() - start
+
+    out = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        for rank, (score, candidate) in enumerate(ranked, 1):
+            out.write(json.dumps(dict(candidate.to_dict(), matchScore=score, rank=rank)) + "\n")
+    finally:
+        if args.output:
+            out.close()
+
+    print(f"Ranked {total} candidates against {len(job_reqs)} requirements in {elapsed:.2f}s", file=sys.stderr)
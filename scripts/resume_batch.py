@@ -0,0 +1,247 @@
+import argparse
+import asyncio
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+
+from gemini_client import AsyncGeminiClient, DEFAULT_CONCURRENCY, DEFAULT_REQUESTS_PER_MINUTE
+from pdf_text import PDF_BACKENDS, extract_text_from_pdf, set_default_backend
+from resume_parser_gemini import extract_resume_data_with_gemini_async, load_env_from_file, parse_resume_text
+
+
+def collect_pdf_paths(source):
+    """Resolve a directory, glob pattern or manifest file into a list of PDF paths."""
+    path = Path(source)
+
+    if path.is_dir():
+        return sorted(str(p) for p in path.rglob("*") if p.suffix.lower() == ".pdf")
+
+    if path.is_file() and path.suffix.lower() != ".pdf":
+        # Manifest: one path per line, or JSONL records with a "pdf_path" field
+        paths = []
+        base_dir = path.parent
+        with open(path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                if line.startswith('{'):
+                    line = json.loads(line).get("pdf_path", "")
+                    if not line:
+                        continue
+                entry = Path(line)
+                paths.append(str(entry if entry.is_absolute() else base_dir / entry))
+        return paths
+
+    if path.is_file():
+        return [str(path)]
+
+    return sorted(glob.glob(source, recursive=True))
+
+
+def parse_pdf_file(pdf_path, job_requirements=None, max_pages=None, max_chars=None):
+    """Parse one PDF with the regex extractors and time it. Runs inside a pool worker."""
+    start = time.perf_counter()
+    try:
+        text = extract_text_from_pdf(pdf_path, max_pages, max_chars)
+        extract_ms = (time.perf_counter() - start) * 1000
+        result = parse_resume_text(text, os.path.basename(pdf_path), job_requirements)
+        return {
+            "pdf_path": pdf_path,
+            "ok": True,
+            "result": result,
+            "timing": {
+                "extract_ms": round(extract_ms, 2),
+                "total_ms": round((time.perf_counter() - start) * 1000, 2)
+            }
+        }
+    except Exception as e:
+        return {
+            "pdf_path": pdf_path,
+            "ok": False,
+            "error": str(e),
+            "timing": {"total_ms": round((time.perf_counter() - start) * 1000, 2)}
+        }
+
+
+def run_batch(pdf_paths, output_file, job_requirements=None, workers=None, max_pages=None, max_chars=None):
+    """Fan PDFs out over a process pool and stream each result to output_file as it finishes."""
+    workers = workers or os.cpu_count() or 1
+    # Keep a bounded number of jobs in flight so huge backfills don't queue every path up front
+    max_in_flight = workers * 4
+    succeeded = 0
+    failed = 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        path_iter = iter(pdf_paths)
+
+        def submit_next():
+            for pdf_path in path_iter:
+                pending.add(executor.submit(parse_pdf_file, pdf_path, job_requirements, max_pages, max_chars))
+                if len(pending) >= max_in_flight:
+                    return
+
+        submit_next()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                record = future.result()
+                if record["ok"]:
+                    succeeded += 1
+                else:
+                    failed += 1
+                    print(f"Error parsing {record['pdf_path']}: {record['error']}", file=sys.stderr)
+                output_file.write(json.dumps(record) + "\n")
+            output_file.flush()
+            submit_next()
+
+    elapsed = time.perf_counter() - start
+    total = succeeded + failed
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(f"Parsed {total} resumes ({failed} failed) in {elapsed:.2f}s with {workers} workers ({rate:.1f} files/s)", file=sys.stderr)
+    return {"succeeded": succeeded, "failed": failed, "elapsed_s": elapsed}
+
+
+async def _run_batch_with_llm(pdf_paths, output_file, api_key, job_requirements, workers,
+                              max_pages, max_chars, concurrency, requests_per_minute):
+    loop = asyncio.get_running_loop()
+    max_in_flight = max(workers, concurrency) * 4
+    counts = {"succeeded": 0, "failed": 0, "llm": 0}
+
+    async def process(pdf_path, executor, client):
+        start = time.perf_counter()
+        filename = os.path.basename(pdf_path)
+        try:
+            # PDF decoding is CPU-bound and runs in the process pool; LLM calls overlap on the event loop
+            text = await loop.run_in_executor(executor, extract_text_from_pdf, pdf_path, max_pages, max_chars)
+            extract_ms = (time.perf_counter() - start) * 1000
+
+            llm_start = time.perf_counter()
+            result = await extract_resume_data_with_gemini_async(client, text, filename, job_requirements, executor) if text else None
+            llm_ms = (time.perf_counter() - llm_start) * 1000
+            parser_used = "gemini"
+            if result is None:
+                parser_used = "regex"
+                result = await loop.run_in_executor(executor, parse_resume_text, text, filename, job_requirements)
+
+            return {
+                "pdf_path": pdf_path,
+                "ok": True,
+                "parser": parser_used,
+                "result": result,
+                "timing": {
+                    "extract_ms": round(extract_ms, 2),
+                    "llm_ms": round(llm_ms, 2),
+                    "total_ms": round((time.perf_counter() - start) * 1000, 2)
+                }
+            }
+        except Exception as e:
+            return {
+                "pdf_path": pdf_path,
+                "ok": False,
+                "error": str(e),
+                "timing": {"total_ms": round((time.perf_counter() - start) * 1000, 2)}
+            }
+
+    def write(done):
+        for task in done:
+            record = task.result()
+            if record["ok"]:
+                counts["succeeded"] += 1
+                counts["llm"] += record["parser"] == "gemini"
+            else:
+                counts["failed"] += 1
+                print(f"Error parsing {record['pdf_path']}: {record['error']}", file=sys.stderr)
+            output_file.write(json.dumps(record) + "\n")
+        output_file.flush()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        async with AsyncGeminiClient(api_key, concurrency=concurrency, requests_per_minute=requests_per_minute) as client:
+            pending = set()
+            for pdf_path in pdf_paths:
+                if len(pending) >= max_in_flight:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    write(done)
+                pending.add(asyncio.create_task(process(pdf_path, executor, client)))
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                write(done)
+    return counts
+
+
+def run_batch_with_llm(pdf_paths, output_file, api_key, job_requirements=None, workers=None, max_pages=None,
+                       max_chars=None, concurrency=DEFAULT_CONCURRENCY, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE):
+    """Parse PDFs with Gemini, extracting text in a process pool and running LLM calls concurrently
+    under the client's rate limit. Falls back to the regex extractors per file."""
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    counts = asyncio.run(_run_batch_with_llm(
+        pdf_paths, output_file, api_key, job_requirements, workers,
+        max_pages, max_chars, concurrency, requests_per_minute
+    ))
+
+    elapsed = time.perf_counter() - start
+    total = counts["succeeded"] + counts["failed"]
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(f"Parsed {total} resumes ({counts['failed']} failed, {counts['llm']} via Gemini) in {elapsed:.2f}s ({rate:.1f} files/s)", file=sys.stderr)
+    return {"succeeded": counts["succeeded"], "failed": counts["failed"], "elapsed_s": elapsed}
+
+
+# Example usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-parse resume PDFs in parallel, streaming results to JSONL")
+    parser.add_argument("source", help="Directory, glob pattern (e.g. 'resumes/**/*.pdf') or manifest file of PDF paths")
+    parser.add_argument("-o", "--output", help="Output JSONL file (defaults to stdout)")
+    parser.add_argument("--job_requirements", help="Job requirements as comma-separated list (optional)")
+    parser.add_argument("--workers", type=int, help="Number of worker processes (defaults to CPU count)")
+    parser.add_argument("--max_pages", type=int, help="Only read the first N pages of each PDF")
+    parser.add_argument("--max_chars", type=int, help="Stop reading each PDF after N characters of text")
+    parser.add_argument("--llm", action="store_true", help="Extract fields with Gemini, falling back to regex per file")
+    parser.add_argument("--api_key", help="Gemini API key for --llm (defaults to GEMINI_API_KEY)")
+    parser.add_argument("--llm_concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Maximum concurrent Gemini requests")
+    parser.add_argument("--llm_rpm", type=float, default=DEFAULT_REQUESTS_PER_MINUTE, help="Gemini requests per minute quota")
+    parser.add_argument("--pdf_backend", help=f"PDF text extractor ({', '.join(sorted(PDF_BACKENDS))}; defaults to RESUME_PDF_BACKEND or pypdf2)")
+    args = parser.parse_args()
+
+    if args.pdf_backend:
+        try:
+            set_default_backend(args.pdf_backend)
+        except ValueError as e:
+            parser.error(str(e))
+        # Worker processes pick the backend up from the environment, however they are started
+        os.environ["RESUME_PDF_BACKEND"] = args.pdf_backend
+
+    job_reqs = None
+    if args.job_requirements:
+        job_reqs = [req.strip() for req in args.job_requirements.split(',')]
+
+    pdf_paths = collect_pdf_paths(args.source)
+    if not pdf_paths:
+        print(f"No PDF files found for {args.source}", file=sys.stderr)
+        sys.exit(1)
+
+    api_key = None
+    if args.llm:
+        api_key = args.api_key or os.environ.get('GEMINI_API_KEY') or load_env_from_file()
+        if not api_key:
+            print("--llm needs a Gemini API key", file=sys.stderr)
+            sys.exit(1)
+
+    out = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        if api_key:
+            run_batch_with_llm(
+                pdf_paths, out, api_key, job_reqs, args.workers, args.max_pages, args.max_chars,
+                args.llm_concurrency, args.llm_rpm
+            )
+        else:
+            run_batch(pdf_paths, out, job_reqs, args.workers, args.max_pages, args.max_chars)
+    finally:
+        if args.output:
+            out.close()
@@ -0,0 +1,252 @@
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import resume_parser_gemini
+from pdf_text import extract_text_from_pdf
+from resume_parser import extract_name, extract_email, extract_phone, extract_skills, extract_experience, extract_education
+from resume_parser_gemini import calculate_match_score, parse_resume
+from resume_sections import segment_sections
+from synthetic_resumes import generate_resume, load_skill_names, text_to_pdf_bytes
+
+DEFAULT_JOB_REQUIREMENTS = ["Python", "React", "SQL", "Docker", "AWS"]
+# Inputs per stage traced with tracemalloc; tracing slows calls down, so it runs apart from timing
+MEMORY_SAMPLE_SIZE = 20
+
+
+def percentile(ordered, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))]
+
+
+def summarize(samples_ms):
+    ordered = sorted(samples_ms)
+    total_ms = sum(ordered)
+    return {
+        "count": len(ordered),
+        "p50_ms": round(percentile(ordered, 50), 4),
+        "p99_ms": round(percentile(ordered, 99), 4),
+        "mean_ms": round(total_ms / len(ordered), 4) if ordered else 0.0,
+        "max_ms": round(ordered[-1], 4) if ordered else 0.0,
+        "throughput_per_s": round(len(ordered) / (total_ms / 1000), 2) if total_ms else 0.0
+    }
+
+
+def peak_allocation_kb(call, inputs):
+    """Largest tracemalloc peak over single calls of a stage, in KiB."""
+    peak = 0
+    tracemalloc.start()
+    try:
+        for args in inputs[:MEMORY_SAMPLE_SIZE]:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            call(*args)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+
+def bench_stage(call, inputs, repeats=1):
+    """Time call(*args) for every input, returning latency stats and peak allocation."""
+    samples = []
+    # Parser paths log to stderr on every call; keep that out of the timings and the report
+    with contextlib.redirect_stderr(io.StringIO()):
+        call(*inputs[0])  # warm caches (compiled patterns, taxonomy, scorers)
+        for _ in range(repeats):
+            for args in inputs:
+                start = time.perf_counter()
+                call(*args)
+                samples.append((time.perf_counter() - start) * 1000)
+        stats = summarize(samples)
+        stats["peak_alloc_kb"] = peak_allocation_kb(call, inputs)
+    return stats
+
+
+def stub_gemini(latency_ms=0.0):
+    """Replace the Gemini HTTP call with a canned response so LLM paths run offline."""
+    body = json.dumps({
+        "candidates": [{
+            "content": {"parts": [{"text": json.dumps({
+                "name": "Stub Candidate",
+                "email": "stub@example.com",
+                "phone": "555-010-0000",
+                "skills": ["python", "react", "sql"],
+                "experience": "5 years of experience",
+                "education": {
+                    "tenth": {"school": "Stub School", "year": "2010", "percentage": "90%"},
+                    "twelfth": {"school": "Stub Junior College", "year": "2012", "percentage": "88%"}
+                }
+            })}]}
+        }]
+    })
+
+    def post_generate_content(api_key, payload, url=None, timeout=None):
+        if latency_ms:
+            time.sleep(latency_ms / 1000)
+        return 200, body
+
+    resume_parser_gemini.post_generate_content = post_generate_content
+
+
+def field_accuracy(results, expectations):
+    """Share of resumes where each regex-extracted field matches the generator's ground truth."""
+    fields = ("name", "email", "phone", "experience", "education")
+    hits = {field: 0 for field in fields + ("skills",)}
+    for result, expected in zip(results, expectations):
+        for field in fields:
+            hits[field] += result.get(field) == expected[field]
+        hits["skills"] += set(expected["skills"]) <= set(result.get("skills", []))
+    return {field: round(count / len(results), 4) for field, count in hits.items()} if results else {}
+
+
+def run_benchmark(count=50, seed=0, repeats=1, job_requirements=None, llm_latency_ms=0.0, **generator_options):
+    """Generate a synthetic corpus and benchmark each parsing stage over it. Returns the JSON report."""
+    job_requirements = job_requirements or DEFAULT_JOB_REQUIREMENTS
+    skill_names = load_skill_names()
+    stub_gemini(llm_latency_ms)
+
+    with tempfile.TemporaryDirectory(prefix="resume-bench-") as work_dir:
+        texts, expectations, pdf_paths = [], [], []
+        pdf_bytes = 0
+        for index in range(count):
+            text, expected = generate_resume(seed + index, skill_names=skill_names, **generator_options)
+            pdf_path = os.path.join(work_dir, f"resume_{index:05d}.pdf")
+            data = text_to_pdf_bytes(text)
+            with open(pdf_path, 'wb') as f:
+                f.write(data)
+            texts.append(text)
+            expectations.append(expected)
+            pdf_paths.append(pdf_path)
+            pdf_bytes += len(data)
+
+        # Downstream stages run on the text PyPDF2 actually produced, not the generator's text
+        extracted = [extract_text_from_pdf(path) for path in pdf_paths]
+        sections = [segment_sections(text) for text in extracted]
+        filenames = [os.path.basename(path) for path in pdf_paths]
+        parsed = [
+            {
+                "skills": extract_skills(text, index),
+                "experience": extract_experience(text, index),
+                "education": extract_education(text, index)
+            }
+            for text, index in zip(extracted, sections)
+        ]
+
+        stages = {
+            "extract_text_from_pdf": (extract_text_from_pdf, [(path,) for path in pdf_paths]),
+            "segment_sections": (segment_sections, [(text,) for text in extracted]),
+            "extract_name": (extract_name, list(zip(extracted, filenames))),
+            "extract_email": (extract_email, [(text,) for text in extracted]),
+            "extract_phone": (extract_phone, [(text,) for text in extracted]),
+            "extract_skills": (extract_skills, list(zip(extracted, sections))),
+            "extract_experience": (extract_experience, list(zip(extracted, sections))),
+            "extract_education": (extract_education, list(zip(extracted, sections))),
+            "calculate_match_score": (
+                calculate_match_score,
+                [(fields["skills"], fields["experience"], job_requirements, fields["education"]) for fields in parsed]
+            ),
+            "parse_resume_regex": (
+                lambda path, name: parse_resume(path, name, None, job_requirements),
+                list(zip(pdf_paths, filenames))
+            ),
+            "parse_resume_gemini_stub": (
+                lambda path, name: parse_resume(path, name, "stub-key", job_requirements),
+                list(zip(pdf_paths, filenames))
+            ),
+            "parse_resume_hybrid_stub": (
+                lambda path, name: parse_resume(path, name, "stub-key", job_requirements, mode="hybrid"),
+                list(zip(pdf_paths, filenames))
+            ),
+        }
+
+        report_stages = {}
+        for name, (call, inputs) in stages.items():
+            report_stages[name] = bench_stage(call, inputs, repeats)
+
+        with contextlib.redirect_stderr(io.StringIO()):
+            regex_results = [parse_resume(path, name, None, job_requirements) for path, name in zip(pdf_paths, filenames)]
+
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        },
+        "corpus": {
+            "resumes": count,
+            "seed": seed,
+            "repeats": repeats,
+            "mean_text_chars": round(sum(len(text) for text in extracted) / count, 1) if count else 0,
+            "mean_pdf_bytes": round(pdf_bytes / count, 1) if count else 0,
+            "generator_options": generator_options,
+            "llm_latency_ms": llm_latency_ms
+        },
+        "stages": report_stages,
+        "regex_field_accuracy": field_accuracy(regex_results, expectations),
+        # ru_maxrss is KiB on Linux and bytes on macOS
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // (1024 if sys.platform == "darwin" else 1)
+    }
+
+
+def compare_to_baseline(report, baseline, tolerance):
+    """List stages whose p50 or p99 grew by more than tolerance (a fraction) over the baseline."""
+    regressions = []
+    for name, stats in report["stages"].items():
+        previous = baseline.get("stages", {}).get(name)
+        if not previous:
+            continue
+        for metric in ("p50_ms", "p99_ms"):
+            if previous[metric] and stats[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(f"{name} {metric} {previous[metric]} -> {stats[metric]}")
+    return regressions
+
+
+# Example usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the resume parser offline on synthetic resumes")
+    parser.add_argument("--count", type=int, default=50, help="Number of synthetic resumes")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first resume")
+    parser.add_argument("--repeats", type=int, default=1, help="Timed passes over the corpus per stage")
+    parser.add_argument("--skills", type=int, default=10, help="Skills listed per resume")
+    parser.add_argument("--jobs", type=int, default=2, help="Jobs listed per resume")
+    parser.add_argument("--filler_lines", type=int, default=0, help="Extra experience lines, to grow resumes past one page")
+    parser.add_argument("--education_layout", choices=["inline", "block"], default="inline", help="How 10th/12th entries are laid out")
+    parser.add_argument("--running_header", action="store_true", help="Repeat a header line at the top of every page")
+    parser.add_argument("--job_requirements", help="Job requirements as comma-separated list")
+    parser.add_argument("--llm_latency_ms", type=float, default=0.0, help="Simulated latency of the stubbed Gemini call")
+    parser.add_argument("--baseline", help="Earlier report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p50/p99 growth over the baseline, as a fraction")
+    parser.add_argument("-o", "--output", help="Write the JSON report here (defaults to stdout)")
+    args = parser.parse_args()
+
+    job_reqs = [req.strip() for req in args.job_requirements.split(',') if req.strip()] if args.job_requirements else None
+    report = run_benchmark(
+        args.count, args.seed, args.repeats, job_reqs, args.llm_latency_ms,
+        skills=args.skills, jobs=args.jobs, filler_lines=args.filler_lines,
+        education_layout=args.education_layout, running_header=args.running_header
+    )
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            regressions = compare_to_baseline(report, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
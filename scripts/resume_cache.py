@@ -0,0 +1,136 @@
+import json
+import sqlite3
+import sys
+import threading
+import time
+
+# Default cap on the combined size of cached text and results
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class ParseCache:
+    """Persistent SQLite cache of extracted text and structured parse results.
+
+    Entries are keyed by the SHA-256 of the PDF bytes plus a version string, so
+    bumping the extractor or prompt version invalidates old entries. Text and
+    results live in separate tables and share one size budget with LRU eviction.
+    """
+
+    def __init__(self, db_path, max_bytes=DEFAULT_MAX_BYTES):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        for table, column in (("texts", "text"), ("results", "result")):
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                f"key TEXT PRIMARY KEY, {column} TEXT NOT NULL, "
+                "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_last_access ON {table}(last_access)")
+        self._conn.commit()
+        self._total_bytes = self._current_size()
+        self.hits = {"text": 0, "result": 0}
+        self.misses = {"text": 0, "result": 0}
+
+    def _current_size(self):
+        row = self._conn.execute(
+            "SELECT (SELECT COALESCE(SUM(size), 0) FROM texts) + (SELECT COALESCE(SUM(size), 0) FROM results)"
+        ).fetchone()
+        return row[0]
+
+    def _get(self, table, column, kind, key):
+        with self._lock:
+            row = self._conn.execute(f"SELECT {column} FROM {table} WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses[kind] += 1
+                return None
+            self.hits[kind] += 1
+            self._conn.execute(f"UPDATE {table} SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            return row[0]
+
+    def _put(self, table, column, key, value):
+        size = len(value.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            # A replaced entry's bytes are freed, so only the difference counts against the budget
+            old = self._conn.execute(f"SELECT size FROM {table} WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {table} (key, {column}, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, size, time.time())
+            )
+            self._conn.commit()
+            self._total_bytes += size - (old[0] if old else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries across both tables until under budget."""
+        # Other processes may share the file, so resync before deciding what to drop
+        self._total_bytes = self._current_size()
+        while self._total_bytes > self.max_bytes:
+            row = self._conn.execute(
+                "SELECT 'texts', key, size, last_access FROM texts "
+                "UNION ALL SELECT 'results', key, size, last_access FROM results "
+                "ORDER BY last_access LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            table, key, size, _ = row
+            self._conn.execute(f"DELETE FROM {table} WHERE key = ?", (key,))
+            self._total_bytes -= size
+        self._conn.commit()
+
+    def get_text(self, pdf_hash, version):
+        return self._get("texts", "text", "text", f"{pdf_hash}:{version}")
+
+    def put_text(self, pdf_hash, version, text):
+        self._put("texts", "text", f"{pdf_hash}:{version}", text)
+
+    def get_result(self, pdf_hash, version):
+        value = self._get("results", "result", "result", f"{pdf_hash}:{version}")
+        return json.loads(value) if value is not None else None
+
+    def put_result(self, pdf_hash, version, result):
+        self._put("results", "result", f"{pdf_hash}:{version}", json.dumps(result))
+
+    def stats(self):
+        """Hit/miss counters of this process, plus entry counts and size of the whole cache file."""
+        with self._lock:
+            entries = {
+                table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("texts", "results")
+            }
+            return {
+                "hits": dict(self.hits),
+                "misses": dict(self.misses),
+                "entries": entries,
+                "bytes": self._current_size(),
+                "max_bytes": self.max_bytes
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Example usage
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or clear the resume parse cache")
+    parser.add_argument("db_path", help="Path to the cache database")
+    parser.add_argument("--clear", action="store_true", help="Delete all cached entries")
+    args = parser.parse_args()
+
+    cache = ParseCache(args.db_path)
+    if args.clear:
+        cache._conn.execute("DELETE FROM texts")
+        cache._conn.execute("DELETE FROM results")
+        cache._conn.commit()
+        print("Cache cleared", file=sys.stderr)
+    print(json.dumps(cache.stats(), indent=2))
+    cache.close()
@@ -1,32 +1,25 @@
-import PyPDF2
-import re
 import json
-import sys
 import time
 import random
 import os
-from pathlib import Path
-
-
-def extract_text_from_pdf(pdf_path):
-    """Extract text from a PDF file using PyPDF2."""
-    try:
-        text = ""
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page in pdf_reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        
-        if not text.strip():
-            print("Warning: No text extracted from PDF", file=sys.stderr)
-            return ""
-            
-        return text
-    except Exception as e:
-        print(f"Error extracting text from PDF: {e}", file=sys.stderr)
-        return ""
+
+from candidate_record import parse_integer
+from pdf_text import extract_text_from_pdf
+from resume_patterns import (
+    EMAIL, PHONE, FILENAME_EXTENSION, FILENAME_SEPARATORS, SKILLS_LIST, EXPERIENCE_YEARS,
+    EDUCATION_ANCHOR, SCHOOL_KEYWORD, SCHOOL_LEADING_NOISE, EDUCATION_YEAR, EDUCATION_PERCENTAGE
+)
+from resume_sections import segment_sections
+from skill_matcher import get_default_matcher
+
+# How far past a 10th/12th anchor education fields are looked for: the rest of the
+# anchor's line plus this many following lines, capped at this many characters
+EDUCATION_WINDOW_LINES = 3
+EDUCATION_WINDOW_CHARS = 300
+# Real resumes have a handful of 10th/12th mentions; stop looking after this many
+MAX_EDUCATION_ANCHORS = 32
+MAX_SCHOOL_NAME_CHARS = 80
+SCHOOL_NAME_DELIMITERS = ",;|:()[]/\t\n-\u2013\u2014"
 
 
 def extract_name(text, filename):
@@ -37,8 +30,8 @@ def extract_name(text, filename):
             return line.strip()
     
     if filename:
-        name = re.sub(r'\.(pdf|doc|docx)$', '', filename, flags=re.IGNORECASE)
-        name = re.sub(r'[_-]', ' ', name)
+        name = FILENAME_EXTENSION.sub('', filename)
+        name = FILENAME_SEPARATORS.sub(' ', name)
         name = ' '.join(word.capitalize() for word in name.split())
         if name:
             return name
@@ -48,144 +41,117 @@ def extract_name(text, filename):
 
 def extract_email(text):
     """Extract email address from the resume."""
-    email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-    emails = re.findall(email_pattern, text)
+    emails = EMAIL.findall(text)
     return emails[0] if emails else ""
 
 
 def extract_phone(text):
     """Extract phone number from the resume."""
-    phone_pattern = r'(?:\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-    phones = re.findall(phone_pattern, text)
+    phones = PHONE.findall(text)
     return phones[0] if phones else ""
 
 
-def extract_skills(text):
+def extract_skills(text, sections=None):
     """Extract skills from the resume."""
-    skill_keywords = [
-        "javascript", "typescript", "react", "node.js", "python", "java", "sql",
-        "aws", "docker", "kubernetes", "git", "agile", "scrum", "leadership",
-        "communication", "problem solving", "project management", "next.js",
-        "express", "mongodb", "postgresql", "redis", "graphql", "rest api",
-        "ci/cd", "jenkins", "github actions", "terraform", "cloud computing",
-        "machine learning", "ai", "data science", "analytics", "testing",
-        "unit testing", "integration testing", "automation", "devops", "html", "css"
-    ]
-    
-    skills_section = ""
-    sections = re.split(r'\n\s*(?:SKILLS|TECHNICAL SKILLS|CORE COMPETENCIES)\s*\n', text, flags=re.IGNORECASE)
-    if len(sections) > 1:
-        skills_section = sections[1]
+    sections = sections or segment_sections(text)
+    start, end = sections.span("skills")
     
-    if not skills_section:
-        skills_section = text
+    found_skills = get_default_matcher().find_skills(text, start, end)
     
-    text_lower = skills_section.lower()
-    found_skills = [skill for skill in skill_keywords if skill in text_lower]
-    
-    skills_list_pattern = r'(?:skills|technical skills|core competencies):\s*([^\.]+)'
-    skills_match = re.search(skills_list_pattern, text, re.IGNORECASE)
+    skills_match = SKILLS_LIST.search(text)
     if skills_match:
-        skills_text = skills_match.group(1)
+        skills_text = skills_match.group("skills")
         for skill in skills_text.split(','):
             skill = skill.strip().lower()
             if skill and skill not in found_skills:
                 found_skills.append(skill)
     
-    if not found_skills:
-        found_skills = ["JavaScript", "React", "Node.js"]
-    
+    # No placeholder skills: an unreadable resume must not score as a JavaScript developer
     return found_skills
 
 
-def extract_experience(text):
+def extract_experience(text, sections=None):
     """Extract years of experience from the resume."""
-    experience_section = ""
-    sections = re.split(r'\n\s*(?:EXPERIENCE|WORK EXPERIENCE|EMPLOYMENT HISTORY)\s*\n', text, flags=re.IGNORECASE)
-    if len(sections) > 1:
-        experience_section = sections[1]
+    sections = sections or segment_sections(text)
     
-    if not experience_section:
-        experience_section = text
-    
-    experience_pattern = r'(\d+)\+?\s*(?:years?|yrs?)\s*(?:of)?\s*experience'
-    match = re.search(experience_pattern, experience_section, re.IGNORECASE)
+    match = sections.search(EXPERIENCE_YEARS, "experience")
     return match.group(0) if match else ""
 
 
-def extract_education(text):
-    """Extract education details from the resume."""
-    education_section = ""
-    sections = re.split(r'\n\s*(?:EDUCATION|QUALIFICATION|ACADEMIC|EDUCATIONAL BACKGROUND)\s*\n', text, flags=re.IGNORECASE)
-    if len(sections) > 1:
-        education_section = sections[1]
-    
-    if not education_section:
-        education_section = text
-    
-    tenth_school = ""
-    tenth_year = ""
-    tenth_percentage = ""
-    
-    tenth_patterns = [
-        r'(?:10th|X|SSC|Secondary School Certificate).*?(?:from|at|in)?\s*([A-Za-z0-9\s\.]+(?:School|College|Institution|Academy|High School))',
-        r'(?:10th|X|SSC|Secondary School Certificate).*?(\d{4})',
-        r'(?:10th|X|SSC|Secondary School Certificate).*?(\d+(?:\.\d+)?%)'
-    ]
-    
-    for pattern in tenth_patterns:
-        match = re.search(pattern, education_section, re.IGNORECASE)
-        if match:
-            if "School" in pattern or "College" in pattern or "Institution" in pattern or "Academy" in pattern or "High School" in pattern:
-                tenth_school = match.group(1).strip()
-            elif r'\d{4}' in pattern:
-                tenth_year = match.group(1).strip()
-            elif r'\d+(?:\.\d+)?%' in pattern:
-                tenth_percentage = match.group(1).strip()
-    
-    twelfth_school = ""
-    twelfth_year = ""
-    twelfth_percentage = ""
-    
-    twelfth_patterns = [
-        r'(?:12th|XII|HSC|Higher Secondary Certificate).*?(?:from|at|in)?\s*([A-Za-z0-9\s\.]+(?:School|College|Institution|Academy|Junior College))',
-        r'(?:12th|XII|HSC|Higher Secondary Certificate).*?(\d{4})',
-        r'(?:12th|XII|HSC|Higher Secondary Certificate).*?(\d+(?:\.\d+)?%)'
-    ]
-    
-    for pattern in twelfth_patterns:
-        match = re.search(pattern, education_section, re.IGNORECASE)
-        if match:
-            if "School" in pattern or "College" in pattern or "Institution" in pattern or "Academy" in pattern or "Junior College" in pattern:
-                twelfth_school = match.group(1).strip()
-            elif r'\d{4}' in pattern:
-                twelfth_year = match.group(1).strip()
-            elif r'\d+(?:\.\d+)?%' in pattern:
-                twelfth_percentage = match.group(1).strip()
+def education_window(text, start, limit):
+    """End offset of the search window that opens at start: a few lines, capped in length."""
+    end = min(limit, start + EDUCATION_WINDOW_CHARS)
+    position = start
+    for _ in range(EDUCATION_WINDOW_LINES + 1):
+        position = text.find('\n', position, end)
+        if position < 0:
+            return end
+        position += 1
+    return position - 1
 
-    return {
-        "tenth": {
-            "school": tenth_school,
-            "year": tenth_year,
-            "percentage": tenth_percentage
-        },
-        "twelfth": {
-            "school": twelfth_school,
-            "year": twelfth_year,
-            "percentage": twelfth_percentage
-        }
-    }
+
+def extract_school(text, start, end):
+    """School name ending in a school keyword inside text[start:end], or ""."""
+    keyword = SCHOOL_KEYWORD.search(text, start, end)
+    if not keyword:
+        return ""
+
+    name_start = max(start, keyword.start() - MAX_SCHOOL_NAME_CHARS)
+    for delimiter in SCHOOL_NAME_DELIMITERS:
+        name_start = max(name_start, text.rfind(delimiter, name_start, keyword.start()) + 1)
+    while name_start < keyword.start() and text[name_start].isspace():
+        name_start += 1
+    noise = SCHOOL_LEADING_NOISE.match(text, name_start, keyword.start())
+    if noise:
+        name_start = noise.end()
+    return text[name_start:keyword.end()].strip()
+
+
+def extract_education(text, sections=None):
+    """Extract education details from the resume.
+
+    Each 10th/12th anchor opens a window that ends at the next anchor or after a few
+    lines, whichever comes first. Windows never overlap and at most
+    MAX_EDUCATION_ANCHORS are visited, so the work is linear in the section size.
+    """
+    sections = sections or segment_sections(text)
+    start, end = sections.span("education")
+
+    education = {level: {"school": "", "year": "", "percentage": ""} for level in ("tenth", "twelfth")}
+    anchors = EDUCATION_ANCHOR.finditer(text, start, end)
+    anchor = next(anchors, None)
+    for _ in range(MAX_EDUCATION_ANCHORS):
+        if anchor is None or all(all(details.values()) for details in education.values()):
+            break
+        next_anchor = next(anchors, None)
+        details = education["twelfth" if anchor.group("twelfth") else "tenth"]
+        if not all(details.values()):
+            window_start = anchor.end()
+            window_end = education_window(text, window_start, next_anchor.start() if next_anchor else end)
+
+            if not details["school"]:
+                details["school"] = extract_school(text, window_start, window_end)
+            if not details["year"]:
+                match = EDUCATION_YEAR.search(text, window_start, window_end)
+                details["year"] = match.group("year") if match else ""
+            if not details["percentage"]:
+                match = EDUCATION_PERCENTAGE.search(text, window_start, window_end)
+                details["percentage"] = match.group("percentage") + "%" if match else ""
+        anchor = next_anchor
+
+    return education
 
 
 def parse_resume(pdf_path, filename):
     """Parse a resume PDF to extract relevant information."""
     text = extract_text_from_pdf(pdf_path)
+    sections = segment_sections(text)
     name = extract_name(text, filename)
     email = extract_email(text)
     phone = extract_phone(text)
-    skills = extract_skills(text)
-    experience = extract_experience(text)
-    education = extract_education(text)
+    skills = extract_skills(text, sections)
+    experience = extract_experience(text, sections)
+    education = extract_education(text, sections)
 
     candidate_id = f"CAND-{int(time.time())}-{random.randint(1000, 9999)}"
     
@@ -210,9 +176,8 @@ def calculate_match_score(skills, experience):
     skill_score = min(len(skills) * 5, 50)  # Max 50 points for skills
     score += skill_score
     
-    years_match = re.search(r'(\d+)', experience)
-    if years_match:
-        years = int(years_match.group(1))
+    years = parse_integer(experience)
+    if years is not None:
         experience_score = min(years * 10, 50)  # Max 50 points for experience
         score += experience_score
 
@@ -1,14 +1,57 @@
-import PyPDF2
 import re
 import json
+import asyncio
 import sys
 import time
 import random
 import os
 from pathlib import Path
-import requests
-import base64
 import argparse
+import socketserver
+import heapq
+from functools import lru_cache
+
+from pdf_text import PDF_BACKENDS, PdfSource, extract_text_from_pdf, open_pdf_source, set_default_backend, text_extractor_version
+from resume_parser import extract_name, extract_email, extract_phone, extract_skills, extract_experience, extract_education
+from resume_cache import ParseCache
+from near_duplicates import DEFAULT_THRESHOLD, DuplicateIndex
+from resume_patterns import enable_pattern_timing, pattern_timings
+from resume_sections import SECTION_INDEX_VERSION, SectionIndex, segment_sections
+from skill_matcher import get_default_matcher
+from match_scoring import RequirementScorer
+from gemini_client import post_generate_content
+from parser_metrics import CACHE_REQUESTS, JOB_SECONDS, JOBS, LLM_CALLS, QUEUE_DEPTH, REGEX_FALLBACKS, STAGE_SECONDS, start_metrics_server
+from prompt_prep import prepare_prompt_text, report_prompt_reduction
+from llm_json import EDUCATION_LEVELS, decode_candidate_json
+from candidate_record import CandidateRecord, parse_decimal, parse_integer
+from stage_profiler import finish_profile, set_stage_observer, stage, start_profile
+
+# Bump these when extraction or the prompt changes so cached entries are not reused
+# (text versions belong to each PDF backend, see pdf_text.register_backend)
+GEMINI_PROMPT_VERSION = "gemini-1.5-pro-3"
+REGEX_PARSER_VERSION = "regex-6"
+# Bump when the layout of stored parse artifacts changes
+PARSE_ARTIFACT_VERSION = 1
+
+# Compiled once so long-running workers don't rebuild it per job
+NAME_PATTERN = re.compile(r"^[A-Za-z][A-Za-z.'-]*(?: [A-Za-z][A-Za-z.'-]*){1,3}$")
+PHONE_DIGITS_PATTERN = re.compile(r'\d')
+
+# Hybrid mode asks the LLM only for fields whose regex confidence is below this
+HYBRID_CONFIDENCE_THRESHOLD = 0.6
+
+# JSON shape of each field, used to build targeted prompts
+FIELD_SCHEMAS = {
+    "name": '"name": "Extracted name"',
+    "email": '"email": "Extracted email"',
+    "phone": '"phone": "Extracted phone"',
+    "skills": '"skills": ["Skill 1", "Skill 2", ...]',
+    "experience": '"experience": "Experience duration (e.g., 2 years)"',
+    "education": '''"education": {
+        "tenth": {"school": "School name", "year": "Year of completion", "percentage": "Percentage or CGPA"},
+        "twelfth": {"school": "School name", "year": "Year of completion", "percentage": "Percentage or CGPA"}
+    }'''
+}
 
 # Try to load from .env file if not set in environment
 def load_env_from_file():
@@ -30,277 +73,677 @@ def load_env_from_file():
         print(f"Error reading .env file: {e}", file=sys.stderr)
         return None
 
-def extract_text_from_pdf(pdf_path):
-    """Extract text from a PDF file using PyPDF2."""
+def encode_pdf_to_base64(pdf):
+    """Encode PDF file to base64 for Gemini API. Accepts a path or an open PdfSource."""
     try:
-        text = ""
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page in pdf_reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        
-        if not text.strip():
-            print("Warning: No text extracted from PDF", file=sys.stderr)
-            return ""
-            
-        return text
+        if isinstance(pdf, PdfSource):
+            return pdf.base64()
+        with PdfSource(pdf) as source:
+            return source.base64()
     except Exception as e:
-        print(f"Error extracting text from PDF: {e}", file=sys.stderr)
-        return ""
+        print(f"Error encoding PDF to base64: {e}", file=sys.stderr)
+        return None
+
+def build_gemini_request(text):
+    """Build the generateContent payload asking Gemini to extract resume fields from text.
+    The text is normalized and trimmed to the prompt token budget first."""
+    with stage("prompt_prep"):
+        text, prompt_stats = prepare_prompt_text(text)
+    report_prompt_reduction(prompt_stats)
+
+    # The prompt that instructs Gemini how to extract and format the resume data
+    prompt = f"""
+    You are a resume parser API. Extract the following information from the resume text below:
+    
+    1. Full name
+    2. Email address
+    3. Phone number
+    4. Skills (as a list)
+    5. Experience (both duration and details)
+    6. Education details, particularly 10th and 12th standard information including:
+       - School name
+       - Year
+       - Percentage/CGPA
+    
+    Format the output as a JSON object with the following structure:
+    {{
+        "name": "Extracted name",
+        "email": "Extracted email",
+        "phone": "Extracted phone",
+        "skills": ["Skill 1", "Skill 2", ...],
+        "experience": "Experience duration (e.g., 2 years)",
+        "education": {{
+            "tenth": {{
+                "school": "School name",
+                "year": "Year of completion",
+                "percentage": "Percentage or CGPA"
+            }},
+            "twelfth": {{
+                "school": "School name",
+                "year": "Year of completion",
+                "percentage": "Percentage or CGPA"
+            }}
+        }}
+    }}
+    
+    Extract the most relevant skills even if they're not explicitly listed under a "Skills" section.
+    
+    Resume text: {text}
+    
+    If you can't find specific information, use empty strings or arrays for those fields. 
+    Respond ONLY with the JSON object and no additional text.
+    """
+    
+    return {
+        "contents": [
+            {
+                "parts": [
+                    {
+                        "text": prompt
+                    }
+                ]
+            }
+        ],
+        "generationConfig": {
+            "temperature": 0.2,
+            "topK": 40,
+            "topP": 0.95,
+            "maxOutputTokens": 1024
+        }
+    }
+
+def decode_gemini_json(response_data, fields=tuple(FIELD_SCHEMAS)):
+    """Pull the candidate fields out of a generateContent response, repairing malformed or
+    truncated JSON. Returns (data, missing, partial) as llm_json.decode_candidate_json does.
+    Raises if the response holds no JSON object at all."""
+    generated_text = response_data["candidates"][0]["content"]["parts"][0]["text"]
+    return decode_candidate_json(generated_text, fields)
 
-def encode_pdf_to_base64(pdf_path):
-    """Encode PDF file to base64 for Gemini API."""
+def decode_full_reply(response_data):
+    """Decode the reply to a full extraction request, counting its outcome in LLM_CALLS.
+    Returns (data, missing, partial) as decode_gemini_json does, or None if unusable."""
     try:
-        with open(pdf_path, 'rb') as file:
-            pdf_bytes = file.read()
-            base64_encoded = base64.b64encode(pdf_bytes).decode('utf-8')
-            return base64_encoded
-    except Exception as e:
-        print(f"Error encoding PDF to base64: {e}", file=sys.stderr)
+        decoded = decode_gemini_json(response_data)
+    except (KeyError, IndexError, TypeError, ValueError) as e:
+        print(f"Error parsing Gemini API response: {e}", file=sys.stderr)
+        print(f"Response: {response_data}", file=sys.stderr)
+        LLM_CALLS.inc(kind="full", outcome="invalid_response")
+        return None
+    _, missing, partial = decoded
+    # stderr stays quiet here: the API route treats any non-warning output as a failed parse
+    LLM_CALLS.inc(kind="full", outcome="incomplete" if missing or partial else "ok")
+    return decoded
+
+def parse_gemini_response(response_data, job_requirements=None, text="", filename="", api_key=None):
+    """Turn a generateContent response into a scored candidate dict, or None if unusable."""
+    fields = parse_gemini_fields(response_data, text, filename, api_key)
+    if fields is None:
+        return None
+    # Generate a candidate ID and calculate match score
+    return finalize_candidate(fields, job_requirements)
+
+def parse_gemini_fields(response_data, text="", filename="", api_key=None):
+    """Unscored candidate fields from a generateContent response, or None if unusable.
+    Fields the reply lacks or cut off are filled in by complete_missing_fields."""
+    decoded = decode_full_reply(response_data)
+    if decoded is None:
         return None
+    parsed_data, missing, partial = decoded
+    if missing or partial:
+        parsed_data = complete_missing_fields(parsed_data, missing, partial, text, filename, api_key)
+    return parsed_data
+
+def complete_missing_fields(data, missing, partial, text, filename, api_key=None):
+    """Ask Gemini again for only the missing and cut-off fields, then fill anything still
+    absent from the regex extractors rather than discarding the rest of the reply."""
+    needed = missing + partial
+    if api_key and text:
+        llm_fields = extract_fields_with_gemini(api_key, text, needed)
+        if llm_fields:
+            data.update(llm_fields)
+            needed = [field for field in needed if field not in llm_fields]
+
+    absent = absent_fields(data, needed)
+    if absent:
+        data.update(extract_regex_fields(text, filename, absent))
+    return data
+
+def absent_fields(data, needed):
+    """Needed fields the reply has no value for at all, counted as a regex fallback."""
+    # A cut-off value is still better than a regex guess; only absent fields fall back
+    absent = [field for field in needed if field not in data]
+    if absent:
+        REGEX_FALLBACKS.inc(reason="incomplete_llm_reply")
+    return absent
 
 def extract_resume_data_with_gemini(api_key, text, filename, job_requirements=None):
     """Extract resume data using Google's Gemini API."""
+    fields = extract_resume_fields_with_gemini(api_key, text, filename)
+    return finalize_candidate(fields, job_requirements) if fields is not None else None
+
+def extract_resume_fields_with_gemini(api_key, text, filename):
+    """Unscored candidate fields from Gemini, or None if the call failed."""
     try:
         # If no API key is provided, fallback to traditional parsing
         if not api_key:
             print("No Gemini API key provided. Falling back to traditional parsing.", file=sys.stderr)
             return None
 
-        # Prepare the request to Gemini API
-        url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-pro:generateContent"
-        
-        # The prompt that instructs Gemini how to extract and format the resume data
-        prompt = f"""
-        You are a resume parser API. Extract the following information from the resume text below:
-        
-        1. Full name
-        2. Email address
-        3. Phone number
-        4. Skills (as a list)
-        5. Experience (both duration and details)
-        6. Education details, particularly 10th and 12th standard information including:
-           - School name
-           - Year
-           - Percentage/CGPA
-        
-        Format the output as a JSON object with the following structure:
-        {{
-            "name": "Extracted name",
-            "email": "Extracted email",
-            "phone": "Extracted phone",
-            "skills": ["Skill 1", "Skill 2", ...],
-            "experience": "Experience duration (e.g., 2 years)",
-            "education": {{
-                "tenth": {{
-                    "school": "School name",
-                    "year": "Year of completion",
-                    "percentage": "Percentage or CGPA"
-                }},
-                "twelfth": {{
-                    "school": "School name",
-                    "year": "Year of completion",
-                    "percentage": "Percentage or CGPA"
-                }}
-            }}
-        }}
-        
-        Extract the most relevant skills even if they're not explicitly listed under a "Skills" section.
-        
-        Resume text: {text}
-        
-        If you can't find specific information, use empty strings or arrays for those fields. 
-        Respond ONLY with the JSON object and no additional text.
-        """
-        
-        # Prepare the request body
-        headers = {
-            "Content-Type": "application/json",
-            "x-goog-api-key": api_key
-        }
-        
-        data = {
-            "contents": [
-                {
-                    "parts": [
-                        {
-                            "text": prompt
-                        }
-                    ]
-                }
-            ],
-            "generationConfig": {
-                "temperature": 0.2,
-                "topK": 40,
-                "topP": 0.95,
-                "maxOutputTokens": 1024
-            }
-        }
+        # Send the request through the pooled session (timeouts and 429/5xx retries included)
+        payload = build_gemini_request(text)
+        with stage("llm"):
+            status, body = post_generate_content(api_key, payload)
         
-        # Send the request to Gemini API
-        response = requests.post(url, headers=headers, json=data)
-        
-        if response.status_code != 200:
-            print(f"Error from Gemini API: {response.status_code} - {response.text}", file=sys.stderr)
+        if status != 200:
+            print(f"Error from Gemini API: {status} - {body}", file=sys.stderr)
+            LLM_CALLS.inc(kind="full", outcome="http_error")
             return None
         
-        response_data = response.json()
-        
-        # Extract the text from the response
-        try:
-            generated_text = response_data["candidates"][0]["content"]["parts"][0]["text"]
-            
-            # Clean up the response to ensure it's valid JSON
-            # Remove markdown code blocks if present
-            generated_text = re.sub(r'```json\s*|\s*```', '', generated_text)
-            generated_text = generated_text.strip()
-            
-            # Parse the JSON response
-            parsed_data = json.loads(generated_text)
-            
-            # Generate a candidate ID
-            candidate_id = f"CAND-{int(time.time())}-{random.randint(1000, 9999)}"
-            parsed_data["candidateId"] = candidate_id
+        return parse_gemini_fields(json.loads(body), text, filename, api_key)
             
-            # Calculate match score
-            match_score = calculate_match_score(
-                parsed_data.get("skills", []), 
-                parsed_data.get("experience", ""),
-                job_requirements,
-                parsed_data.get("education", {})
-            )
-            parsed_data["matchScore"] = match_score
-            
-            return parsed_data
-            
-        except (KeyError, json.JSONDecodeError) as e:
-            print(f"Error parsing Gemini API response: {e}", file=sys.stderr)
-            print(f"Response: {response_data}", file=sys.stderr)
+    except Exception as e:
+        print(f"Error using Gemini API: {e}", file=sys.stderr)
+        LLM_CALLS.inc(kind="full", outcome="error")
+        return None
+
+async def extract_resume_data_with_gemini_async(client, text, filename, job_requirements=None, executor=None):
+    """Extract resume data through a shared AsyncGeminiClient, for concurrent bulk parsing.
+    Missing fields are re-requested through the same client; regex fills run on executor."""
+    try:
+        response_data = await client.generate(build_gemini_request(text))
+        if response_data is None:
+            LLM_CALLS.inc(kind="full", outcome="error")
             return None
-            
+        decoded = decode_full_reply(response_data)
+        if decoded is None:
+            return None
+        parsed_data, missing, partial = decoded
+        if missing or partial:
+            parsed_data = await complete_missing_fields_async(client, parsed_data, missing, partial, text, filename, executor)
+        return finalize_candidate(parsed_data, job_requirements)
     except Exception as e:
         print(f"Error using Gemini API: {e}", file=sys.stderr)
+        LLM_CALLS.inc(kind="full", outcome="error")
+        return None
+
+async def complete_missing_fields_async(client, data, missing, partial, text, filename, executor=None):
+    """complete_missing_fields for the async client, keeping the regex work off the event loop."""
+    needed = missing + partial
+    if text:
+        llm_fields = await extract_fields_with_gemini_async(client, text, needed)
+        if llm_fields:
+            data.update(llm_fields)
+            needed = [field for field in needed if field not in llm_fields]
+
+    absent = absent_fields(data, needed)
+    if absent:
+        loop = asyncio.get_running_loop()
+        data.update(await loop.run_in_executor(executor, extract_regex_fields, text, filename, absent))
+    return data
+
+def score_field_confidence(fields, filename=""):
+    """Estimate how far each regex-extracted field can be trusted, from 0 (missing) to 1."""
+    confidence = {}
+
+    name = fields.get("name", "")
+    filename_name = extract_name("", filename) if filename else ""
+    if not name or name == filename_name:
+        confidence["name"] = 0.3 if name else 0.0
+    else:
+        confidence["name"] = 0.9 if NAME_PATTERN.match(name) else 0.5
+
+    confidence["email"] = 1.0 if fields.get("email") else 0.0
+
+    digit_count = len(PHONE_DIGITS_PATTERN.findall(fields.get("phone", "")))
+    confidence["phone"] = 0.9 if 10 <= digit_count <= 13 else 0.0
+
+    skills = fields.get("skills", [])
+    if not skills:
+        confidence["skills"] = 0.0
+    else:
+        confidence["skills"] = min(len(skills) / 5, 1.0)
+
+    confidence["experience"] = 0.8 if fields.get("experience") else 0.0
+
+    education = fields.get("education", {})
+    values = [value for level in ("tenth", "twelfth") for value in education.get(level, {}).values()]
+    confidence["education"] = sum(1 for value in values if value) / len(values) if values else 0.0
+
+    return confidence
+
+def build_targeted_gemini_request(text, fields):
+    """Build a small generateContent payload that asks only for the given fields."""
+    with stage("prompt_prep"):
+        text, prompt_stats = prepare_prompt_text(text)
+    report_prompt_reduction(prompt_stats)
+
+    schema = ",\n    ".join(FIELD_SCHEMAS[field] for field in fields)
+    prompt = f"""
+    You are a resume parser API. From the resume text below, extract only these fields: {", ".join(fields)}.
+    
+    Format the output as a JSON object with exactly this structure:
+    {{
+    {schema}
+    }}
+    
+    Resume text: {text}
+    
+    If you can't find specific information, use empty strings or arrays for those fields. 
+    Respond ONLY with the JSON object and no additional text.
+    """
+
+    return {
+        "contents": [{"parts": [{"text": prompt}]}],
+        "generationConfig": {
+            "temperature": 0.2,
+            "topK": 40,
+            "topP": 0.95,
+            "maxOutputTokens": 512
+        }
+    }
+
+def extract_fields_with_gemini(api_key, text, fields):
+    """Ask Gemini for a subset of fields. Returns a dict of those fields, or None on failure."""
+    try:
+        payload = build_targeted_gemini_request(text, fields)
+        with stage("llm"):
+            status, body = post_generate_content(api_key, payload)
+        if status != 200:
+            print(f"Error from Gemini API: {status} - {body}", file=sys.stderr)
+            LLM_CALLS.inc(kind="fields", outcome="http_error")
+            return None
+        parsed_data, _, _ = decode_gemini_json(json.loads(body), fields)
+        LLM_CALLS.inc(kind="fields", outcome="ok")
+        return {field: parsed_data[field] for field in fields if field in parsed_data}
+    except Exception as e:
+        print(f"Error using Gemini API for fields {fields}: {e}", file=sys.stderr)
+        LLM_CALLS.inc(kind="fields", outcome="error")
         return None
 
+async def extract_fields_with_gemini_async(client, text, fields):
+    """extract_fields_with_gemini through a shared AsyncGeminiClient."""
+    try:
+        response_data = await client.generate(build_targeted_gemini_request(text, fields))
+        if response_data is None:
+            LLM_CALLS.inc(kind="fields", outcome="error")
+            return None
+        parsed_data, _, _ = decode_gemini_json(response_data, fields)
+        LLM_CALLS.inc(kind="fields", outcome="ok")
+        return {field: parsed_data[field] for field in fields if field in parsed_data}
+    except Exception as e:
+        print(f"Error using Gemini API for fields {fields}: {e}", file=sys.stderr)
+        LLM_CALLS.inc(kind="fields", outcome="error")
+        return None
+
+def extract_regex_fields(text, filename, fields=tuple(FIELD_SCHEMAS), sections=None):
+    """Run the regex extractors for the given candidate fields only."""
+    extractors = {
+        "name": lambda sections: extract_name(text, filename),
+        "email": lambda sections: extract_email(text),
+        "phone": lambda sections: extract_phone(text),
+        "skills": lambda sections: extract_skills(text, sections),
+        "experience": lambda sections: extract_experience(text, sections),
+        "education": lambda sections: extract_education(text, sections)
+    }
+    with stage("regex"):
+        if sections is None:
+            sections = segment_sections(text)
+        return {field: extractors[field](sections) for field in fields}
+
+def parse_resume_hybrid(text, filename, api_key, job_requirements=None, sections=None):
+    """Run the regex extractors first and call the LLM only for missing or low-confidence fields.
+    Returns the candidate and whether every requested field was answered by the LLM."""
+    fields = extract_regex_fields(text, filename, sections=sections)
+    complete = fill_uncertain_fields(fields, uncertain_fields(fields, filename), text, api_key)
+    return finalize_candidate(fields, job_requirements), complete
+
+def uncertain_fields(fields, filename=""):
+    """Regex fields too unreliable to keep in hybrid mode, in FIELD_SCHEMAS order."""
+    confidence = score_field_confidence(fields, filename)
+    return [field for field in FIELD_SCHEMAS if confidence[field] < HYBRID_CONFIDENCE_THRESHOLD]
+
+def fill_uncertain_fields(fields, uncertain, text, api_key):
+    """Replace the uncertain regex fields in place with Gemini's answers.
+    Returns False if the LLM call failed and the regex values were kept."""
+    if not uncertain or not text:
+        return True
+    llm_fields = extract_fields_with_gemini(api_key, text, uncertain)
+    if llm_fields is None:
+        REGEX_FALLBACKS.inc(reason="llm_failed")
+        return False
+    for field, value in llm_fields.items():
+        fields[field] = merge_llm_value(fields.get(field), value)
+    return True
+
+def merge_llm_value(current, value):
+    """The LLM's value where it found one, else the current one. Dicts such as education
+    merge key by key, so an empty school or year never replaces a regex value."""
+    if isinstance(value, dict) and isinstance(current, dict):
+        merged = dict(current)
+        for key, sub_value in value.items():
+            merged[key] = merge_llm_value(current.get(key), sub_value)
+        return merged
+    return value if value or current is None else current
+
 def calculate_match_score(skills, experience, job_requirements=None, education=None):
     """Calculate a match score based on skills, experience, and job requirements.
     If job_requirements is provided, compare skills against them.
     Use education scores as tiebreakers."""
-    base_score = 0
-    skill_score = 0
-    experience_score = 0
-    education_score = 0
     max_score = 100
-    
+
     # Calculate skill score (max 60 points)
+    skill_score = 0
     if isinstance(skills, list) and skills:
-        if job_requirements and isinstance(job_requirements, list) and job_requirements:
+        if job_requirements and isinstance(job_requirements, list):
             # Compare skills with job requirements using similarity matching
-            matched_skills = 0
-            total_requirements = len(job_requirements)
-            
-            for req in job_requirements:
-                req_lower = req.lower()
-                best_match = 0
-                
-                for skill in skills:
-                    skill_lower = skill.lower()
-                    # Direct match
-                    if req_lower in skill_lower or skill_lower in req_lower:
-                        best_match = 1
-                        break
-                    # Similarity match
-                    match_score = similarity(req_lower, skill_lower)
-                    best_match = max(best_match, match_score)
-                
-                matched_skills += best_match
-            
-            # Calculate percentage of matched requirements
-            if total_requirements > 0:
-                skill_score = int((matched_skills / total_requirements) * 60)
-            else:
-                skill_score = 30  # Default if no requirements specified
+            skill_score = get_requirement_scorer(tuple(job_requirements)).skill_score(skills)
         else:
             # Fallback if no job requirements provided
             skill_score = min(len(skills) * 5, 60)  # Max 60 points for skills
-    
-    # Calculate experience score (max 30 points)
-    years_match = re.search(r'(\d+)', str(experience))
-    if years_match:
-        years = int(years_match.group(1))
-        experience_score = min(years * 6, 30)  # Max 30 points for experience
-    
-    # Calculate education score (max 10 points)
-    if education and isinstance(education, dict):
-        tenth_score = 0
-        twelfth_score = 0
-        
-        # Process 10th percentage
-        if 'tenth' in education and 'percentage' in education['tenth']:
-            try:
-                percentage_str = education['tenth']['percentage']
-                # Extract numeric value from percentage string
-                percentage_match = re.search(r'(\d+(\.\d+)?)', str(percentage_str))
-                if percentage_match:
-                    percentage = float(percentage_match.group(1))
-                    tenth_score = min(percentage / 20, 5)  # Max 5 points, scaled from percentage
-            except (ValueError, TypeError):
-                pass
-        
-        # Process 12th percentage
-        if 'twelfth' in education and 'percentage' in education['twelfth']:
-            try:
-                percentage_str = education['twelfth']['percentage']
-                # Extract numeric value from percentage string
-                percentage_match = re.search(r'(\d+(\.\d+)?)', str(percentage_str))
-                if percentage_match:
-                    percentage = float(percentage_match.group(1))
-                    twelfth_score = min(percentage / 20, 5)  # Max 5 points, scaled from percentage
-            except (ValueError, TypeError):
-                pass
-        
-        education_score = tenth_score + twelfth_score
-    
-    # Calculate total score
-    base_score = skill_score + experience_score
-    total_score = base_score + education_score
+
+    total_score = skill_score + experience_score(experience) + education_score(education)
     
     # Ensure score is within range 0-100
     return min(max(total_score, 0), max_score)
 
-def similarity(a, b):
-    """Measure similarity between two strings."""
-    from difflib import SequenceMatcher
-    return SequenceMatcher(None, a, b).ratio()
+@lru_cache(maxsize=32)
+def get_requirement_scorer(job_requirements):
+    """Build (and reuse) the scorer for one job's requirements, with its memoized skill rows."""
+    return RequirementScorer(job_requirements)
+
+def experience_score(experience):
+    """Experience component of the match score (max 30 points)."""
+    return experience_points(parse_integer(experience))
+
+def experience_points(years):
+    """Experience points for an already parsed number of years."""
+    return min(years * 6, 30) if years is not None else 0  # Max 30 points for experience
+
+def education_score(education):
+    """Education component of the match score (max 10 points), used as a tiebreaker."""
+    if not education or not isinstance(education, dict):
+        return 0
+    return education_points(
+        parse_decimal(education[level].get('percentage')) if isinstance(education.get(level), dict) else None
+        for level in EDUCATION_LEVELS
+    )
+
+def education_points(percentages):
+    """Education points for already parsed percentages (None where there is none)."""
+    # Max 5 points per level, scaled from percentage
+    return sum(min(percentage / 20, 5) for percentage in percentages if percentage is not None)
+
+def rank_candidates(candidates, job_requirements, top_k=None):
+    """Score many parsed candidates against one job and return (score, candidate) pairs, best first.
+    Candidates may be dicts or CandidateRecords; dicts are converted once so numeric fields are
+    parsed a single time. Skill components for all candidates are computed in a single vectorized pass."""
+    candidates = list(candidates)
+    records = [
+        candidate if isinstance(candidate, CandidateRecord) else CandidateRecord.from_dict(candidate)
+        for candidate in candidates
+    ]
+    skill_lists = [record.skills for record in records]
+
+    if job_requirements:
+        skill_scores = get_requirement_scorer(tuple(job_requirements)).score_candidates(skill_lists)
+    else:
+        skill_scores = [min(len(skills) * 5, 60) for skills in skill_lists]
+
+    scored = []
+    for candidate, record, skill_score in zip(candidates, records, skill_scores):
+        total_score = (
+            int(skill_score) + experience_points(record.experience_years)
+            + education_points(record.education_percentages())
+        )
+        scored.append((min(max(total_score, 0), 100), candidate))
+
+    if top_k is not None:
+        return heapq.nlargest(top_k, scored, key=lambda pair: pair[0])
+    return sorted(scored, key=lambda pair: pair[0], reverse=True)
+
+def parse_resume(pdf_path, filename, api_key=None, job_requirements=None, cache=None, max_pages=None, max_chars=None,
+                 mode="full", duplicates=None):
+    """Parse a resume PDF to extract relevant information.
+    If a ParseCache is given, reuse text and results cached for identical PDF bytes.
+    If a DuplicateIndex is given, reuse the result of an earlier near-identical resume.
+    max_pages/max_chars bound how much of the PDF is decoded. In "hybrid" mode the regex
+    extractors run first and the LLM is only asked for fields they couldn't find."""
+    result, _ = _parse_resume(pdf_path, filename, api_key, job_requirements, cache, max_pages, max_chars, mode,
+                              duplicates)
+    return result
+
+def parse_resume_with_artifact(pdf_path, filename, api_key=None, job_requirements=None, cache=None, max_pages=None,
+                               max_chars=None, mode="full", duplicates=None):
+    """Like parse_resume, but also return a parse artifact (text, section index and unscored
+    fields) that rescore_from_artifact can reuse without touching the PDF or the LLM."""
+    return _parse_resume(pdf_path, filename, api_key, job_requirements, cache, max_pages, max_chars, mode,
+                         duplicates, True)
+
+def _parse_resume(pdf_path, filename, api_key, job_requirements, cache, max_pages, max_chars, mode,
+                  duplicates=None, with_artifact=False):
+    budget = parse_budget(max_pages, max_chars)
+    result_version = parse_result_version(api_key, mode, budget)
+    loaded = read_resume(pdf_path, result_version, budget, cache, max_pages, max_chars, duplicates, with_artifact)
+    if loaded["result"] is not None:
+        artifact = None
+        if with_artifact:
+            artifact = build_parse_artifact(loaded["text"], loaded["result"], result_version, budget, loaded["pdf_hash"])
+        return finalize_candidate(loaded["result"], job_requirements), artifact
+
+    text = loaded["text"]
+    sections = None
+    if with_artifact:
+        # Segment once and share the index between the extractors and the artifact
+        with stage("regex"):
+            sections = segment_sections(text)
+    result, fields_version = extract_candidate(text, filename, api_key, job_requirements, mode, sections)
+    if fields_version:
+        fields_version += budget
+        remember_parse(loaded, result, fields_version, cache, duplicates)
+
+    artifact = build_parse_artifact(text, result, fields_version, budget, loaded["pdf_hash"], sections) if with_artifact else None
+    return result, artifact
+
+def parse_budget(max_pages=None, max_chars=None):
+    """Truncated text gives different results, so budgets are part of the cache key."""
+    return f"/pages-{max_pages}/chars-{max_chars}" if max_pages or max_chars else ""
+
+def parse_result_version(api_key=None, mode="full", budget=""):
+    """Version of the extractor a parse with these settings would use, for cache and dedupe lookups."""
+    llm_version = hybrid_result_version() if mode == "hybrid" else GEMINI_PROMPT_VERSION
+    return (llm_version if api_key else regex_result_version()) + budget
+
+def read_resume(pdf_path, result_version, budget="", cache=None, max_pages=None, max_chars=None, duplicates=None,
+                with_text=False, executor=None):
+    """The front of a parse: cache lookup, PDF text extraction and near-duplicate lookup.
+
+    Returns a dict with the PDF's hash, its text and MinHash signature, and under
+    "result" the unscored fields of an earlier parse that can be reused (else None).
+    A cache hit skips text extraction unless with_text is set. PDF decoding runs on
+    executor when one is given, e.g. a process pool shared by pipeline workers.
+    """
+    loaded = {"pdf_hash": None, "text": None, "signature": None, "result": None}
+
+    # Map the PDF once and share it between the hasher and the text extractor
+    source = open_pdf_source(pdf_path)
+    try:
+        if cache and source:
+            with stage("cache"):
+                loaded["pdf_hash"] = source.sha256()
+                cached = cache.get_result(loaded["pdf_hash"], result_version)
+            CACHE_REQUESTS.inc(kind="result", outcome="hit" if cached else "miss")
+            if cached:
+                if with_text:
+                    loaded["text"] = cache.get_text(loaded["pdf_hash"], text_extractor_version() + budget)
+                loaded["result"] = cached
+                return loaded
+        elif (with_text or duplicates) and source:
+            loaded["pdf_hash"] = source.sha256()
+
+        text = None
+        if loaded["pdf_hash"] and cache:
+            with stage("cache"):
+                text = cache.get_text(loaded["pdf_hash"], text_extractor_version() + budget)
+            CACHE_REQUESTS.inc(kind="text", outcome="miss" if text is None else "hit")
+        if text is None:
+            with stage("pdf_text"):
+                if not source:
+                    text = ""
+                elif executor:
+                    text = executor.submit(extract_text_from_pdf, pdf_path, max_pages, max_chars).result()
+                else:
+                    text = extract_text_from_pdf(source, max_pages, max_chars)
+            if loaded["pdf_hash"] and cache and text:
+                with stage("cache"):
+                    cache.put_text(loaded["pdf_hash"], text_extractor_version() + budget, text)
+        loaded["text"] = text
+    finally:
+        if source:
+            source.close()
+
+    if duplicates and text:
+        with stage("dedupe"):
+            loaded["signature"] = duplicates.signature(text)
+            match = duplicates.lookup(loaded["signature"], result_version)
+        CACHE_REQUESTS.inc(kind="near_duplicate", outcome="hit" if match else "miss")
+        if match:
+            # Reported through the near_duplicate cache metric; stderr stays quiet on success
+            loaded["result"] = match[2]
+    return loaded
+
+def remember_parse(loaded, result, fields_version, cache=None, duplicates=None):
+    """Store a fresh parse's unscored fields in the cache and near-duplicate index for reuse.
+    Parses of PDFs that yielded no text are never stored: OCR may only have been skipped or
+    timed out, and the fields would hold nothing but a name guessed from this upload's filename."""
+    pdf_hash = loaded["pdf_hash"]
+    if not has_resume_text(loaded["text"]):
+        return
+    if pdf_hash and cache:
+        with stage("cache"):
+            cache.put_result(pdf_hash, fields_version, strip_candidate_scoring(result))
+    if duplicates and loaded["signature"] is not None and pdf_hash:
+        with stage("dedupe"):
+            duplicates.add(pdf_hash, loaded["signature"], fields_version, strip_candidate_scoring(result))
+
+def extract_candidate(text, filename, api_key=None, job_requirements=None, mode="full", sections=None):
+    """Extract and score candidate fields from resume text with Gemini, hybrid or regex parsing.
+    Returns the candidate and the version of the extractor that produced its fields, or None
+    when regex values stood in for a failed LLM call and the fields shouldn't be reused."""
+    # A PDF without text (failed extraction, skipped OCR) isn't worth a Gemini call
+    use_llm = api_key and has_resume_text(text)
+    if use_llm and mode == "hybrid":
+        result, complete = parse_resume_hybrid(text, filename, api_key, job_requirements, sections)
+        return result, hybrid_result_version() if complete else None
 
-def parse_resume(pdf_path, filename, api_key=None, job_requirements=None):
-    """Parse a resume PDF to extract relevant information."""
-    text = extract_text_from_pdf(pdf_path)
-    
     # Try using Gemini API first
-    if api_key:
+    if use_llm:
         gemini_data = extract_resume_data_with_gemini(api_key, text, filename, job_requirements)
         if gemini_data:
-            return gemini_data
+            return gemini_data, GEMINI_PROMPT_VERSION
     
     # Fallback to traditional parsing if Gemini API fails or is not available
     print("Falling back to traditional parsing", file=sys.stderr)
-    
-    # Import functions from the original parser
-    from resume_parser import extract_name, extract_email, extract_phone, extract_skills, extract_experience, extract_education
-    
-    name = extract_name(text, filename)
-    email = extract_email(text)
-    phone = extract_phone(text)
-    skills = extract_skills(text)
-    experience = extract_experience(text)
-    education = extract_education(text)
+    REGEX_FALLBACKS.inc(reason=regex_fallback_reason(api_key, text))
+    return parse_resume_text(text, filename, job_requirements, sections), regex_result_version()
+
+def has_resume_text(text):
+    """Whether extraction produced any text to parse."""
+    return bool(text and text.strip())
+
+def regex_fallback_reason(api_key, text):
+    """Label for REGEX_FALLBACKS when regex values stand in for the LLM's."""
+    if not api_key:
+        return "no_api_key"
+    return "llm_failed" if has_resume_text(text) else "no_text"
+
+def build_parse_artifact(text, result, fields_version, budget="", pdf_hash=None, sections=None):
+    """Package the intermediate outputs of a parse so later rescoring can skip the PDF and LLM."""
+    if sections is None and text is not None:
+        sections = segment_sections(text)
+    return {
+        "artifact_version": PARSE_ARTIFACT_VERSION,
+        "pdf_sha256": pdf_hash,
+        "budget": budget,
+        "text_version": text_extractor_version() + budget,
+        "text": text,
+        "sections_version": SECTION_INDEX_VERSION,
+        "sections": [list(section) for section in sections.sections] if sections else [],
+        "fields_version": fields_version,
+        "fields": strip_candidate_scoring(result)
+    }
+
+def rescore_from_artifact(artifact, job_requirements=None, filename="", api_key=None, mode="full"):
+    """Score a stored parse artifact against (new) job requirements.
+
+    Fields produced by a current extractor version are rescored as they are. Otherwise
+    extraction runs again on the stored text, reusing the stored section index when it is
+    still current; the PDF is never decoded. Returns the candidate and the artifact,
+    which is a new one if extraction had to run. Raises ValueError if the artifact is
+    unusable and the PDF must be parsed again."""
+    if not isinstance(artifact, dict) or artifact.get("artifact_version") != PARSE_ARTIFACT_VERSION:
+        raise ValueError("Unsupported parse artifact; parse the PDF again")
+
+    budget = artifact.get("budget") or ""
+    current_versions = {
+        version + budget for version in (regex_result_version(), GEMINI_PROMPT_VERSION, hybrid_result_version())
+    }
+    if artifact.get("fields") and artifact.get("fields_version") in current_versions:
+        return finalize_candidate(artifact["fields"], job_requirements), artifact
+
+    text = artifact.get("text")
+    if text is None or artifact.get("text_version") != text_extractor_version() + budget:
+        raise ValueError("Parse artifact is out of date and has no reusable text; parse the PDF again")
+
+    if artifact.get("sections_version") == SECTION_INDEX_VERSION:
+        sections = SectionIndex.from_sections(text, artifact.get("sections") or [])
+    else:
+        sections = segment_sections(text)
+    result, fields_version = extract_candidate(text, filename, api_key, job_requirements, mode, sections)
+    if fields_version:
+        fields_version += budget
+    return result, build_parse_artifact(text, result, fields_version, budget, artifact.get("pdf_sha256"), sections)
+
+def regex_result_version():
+    """Cache version for regex parse results, which also depend on the skill taxonomy."""
+    return f"{REGEX_PARSER_VERSION}/taxonomy-{get_default_matcher().version}"
+
+def hybrid_result_version():
+    """Cache version for hybrid results, which mix LLM and regex fields."""
+    return f"hybrid/{GEMINI_PROMPT_VERSION}/{regex_result_version()}"
+
+def strip_candidate_scoring(data):
+    """Drop the per-application fields so a parse result can be cached and reused."""
+    return {key: value for key, value in data.items() if key not in ("candidateId", "matchScore")}
+
+def finalize_candidate(data, job_requirements=None):
+    """Attach a fresh candidate ID and a match score for the given job to parsed fields."""
+    result = dict(data)
+    result["candidateId"] = f"CAND-{int(time.time())}-{random.randint(1000, 9999)}"
+    with stage("scoring"):
+        result["matchScore"] = calculate_match_score(
+            result.get("skills", []),
+            result.get("experience", ""),
+            job_requirements,
+            result.get("education", {})
+        )
+    return result
+
+def parse_resume_text(text, filename, job_requirements=None, sections=None):
+    """Run the regex extractors and scoring over already extracted resume text."""
+    with stage("regex"):
+        if sections is None:
+            sections = segment_sections(text)
+        name = extract_name(text, filename)
+        email = extract_email(text)
+        phone = extract_phone(text)
+        skills = extract_skills(text, sections)
+        experience = extract_experience(text, sections)
+        education = extract_education(text, sections)
 
     candidate_id = f"CAND-{int(time.time())}-{random.randint(1000, 9999)}"
     
-    match_score = calculate_match_score(skills, experience, job_requirements, education)
+    with stage("scoring"):
+        match_score = calculate_match_score(skills, experience, job_requirements, education)
 
     return {
         "name": name,
@@ -313,13 +756,146 @@ def parse_resume(pdf_path, filename, api_key=None, job_requirements=None):
         "matchScore": match_score
     }
 
+def handle_job(job, api_key=None, cache=None, default_mode="full", duplicates=None):
+    """Run a single parse job from the worker protocol and wrap the result."""
+    job_id = job.get("id") if isinstance(job, dict) else None
+    if not isinstance(job, dict) or not (job.get("pdf_path") or job.get("artifact")):
+        return {"id": job_id, "ok": False, "error": "Job is missing pdf_path or artifact"}
+
+    try:
+        pdf_path = job.get("pdf_path")
+        filename = job.get("filename") or (os.path.basename(pdf_path) if pdf_path else "")
+
+        job_reqs = job.get("job_requirements")
+        if isinstance(job_reqs, str):
+            job_reqs = [req.strip() for req in job_reqs.split(',') if req.strip()]
+
+        # Jobs can ask for a profile; otherwise RESUME_PROFILE_SAMPLE_RATE decides
+        profile = start_profile(force=bool(job.get("profile")))
+        try:
+            mode = job.get("mode") or default_mode
+            if job.get("artifact"):
+                # Rescore a stored artifact, e.g. for new job requirements, without the PDF
+                result, artifact = rescore_from_artifact(
+                    job["artifact"], job_reqs, filename, job.get("api_key") or api_key, mode
+                )
+            else:
+                result, artifact = _parse_resume(
+                    pdf_path, filename, job.get("api_key") or api_key, job_reqs, cache,
+                    job.get("max_pages"), job.get("max_chars"), mode, duplicates, bool(job.get("return_artifact"))
+                )
+        finally:
+            timings = finish_profile(profile)
+        response = {"id": job_id, "ok": True, "result": result}
+        if job.get("return_artifact"):
+            response["artifact"] = artifact
+        if timings:
+            response["timings"] = timings
+        return response
+    except Exception as e:
+        print(f"Error handling parse job {job_id}: {e}", file=sys.stderr)
+        return {"id": job_id, "ok": False, "error": str(e)}
+
+def handle_job_line(line, api_key=None, cache=None, mode="full", duplicates=None, pipeline=None):
+    """Decode one newline-delimited JSON job and encode its response line.
+    With a ParsePipeline the job runs through its stage queues instead of inline."""
+    QUEUE_DEPTH.inc()
+    start = time.perf_counter()
+    try:
+        try:
+            job = json.loads(line)
+        except json.JSONDecodeError as e:
+            response = {"id": None, "ok": False, "error": f"Invalid job JSON: {e}"}
+        else:
+            response = pipeline.run_job(job) if pipeline else handle_job(job, api_key, cache, mode, duplicates)
+    finally:
+        QUEUE_DEPTH.dec()
+        JOB_SECONDS.observe(time.perf_counter() - start)
+    JOBS.inc(outcome="ok" if response["ok"] else "error")
+    return json.dumps(response)
+
+def serve_stdio(api_key=None, cache=None, mode="full", duplicates=None):
+    """Serve parse jobs as newline-delimited JSON over stdin/stdout."""
+    print("Resume parser worker reading jobs from stdin", file=sys.stderr)
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        sys.stdout.write(handle_job_line(line, api_key, cache, mode, duplicates) + "\n")
+        sys.stdout.flush()
+
+class ParseJobHandler(socketserver.StreamRequestHandler):
+    """Answer each newline-delimited JSON job on a connection with one result line."""
+
+    def handle(self):
+        for raw_line in self.rfile:
+            line = raw_line.decode('utf-8')
+            if not line.strip():
+                continue
+            response = handle_job_line(
+                line, self.server.api_key, self.server.cache, self.server.mode, self.server.duplicates,
+                self.server.pipeline
+            )
+            self.wfile.write((response + "\n").encode('utf-8'))
+            self.wfile.flush()
+
+class ParseJobServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, api_key=None, cache=None, mode="full", duplicates=None, pipeline=None):
+        self.api_key = api_key
+        self.cache = cache
+        self.mode = mode
+        self.duplicates = duplicates
+        self.pipeline = pipeline
+        super().__init__(socket_path, ParseJobHandler)
+
+def serve_unix_socket(socket_path, api_key=None, cache=None, mode="full", duplicates=None, pipeline=None):
+    """Serve parse jobs as newline-delimited JSON over a local Unix socket.
+    Each connection gets its own thread, so with a pipeline concurrent uploads overlap stage by stage."""
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    with ParseJobServer(socket_path, api_key, cache, mode, duplicates, pipeline) as server:
+        print(f"Resume parser worker listening on {socket_path}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+
 # Example usage
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Parse resume PDF using Gemini API")
-    parser.add_argument("pdf_path", help="Path to the resume PDF file")
+    parser.add_argument("pdf_path", nargs="?", help="Path to the resume PDF file")
     parser.add_argument("--api_key", help="Gemini API key (optional)")
     parser.add_argument("--job_requirements", help="Job requirements as comma-separated list (optional)")
+    parser.add_argument("--serve", action="store_true", help="Run as a long-lived worker reading newline-delimited JSON jobs")
+    parser.add_argument("--socket", help="Unix socket path for --serve (defaults to stdin/stdout)")
+    parser.add_argument("--cache", default=os.environ.get("RESUME_PARSER_CACHE"), help="Path to a SQLite parse cache keyed on PDF content (optional)")
+    parser.add_argument("--mode", choices=["full", "hybrid"], default=os.environ.get("RESUME_PARSER_MODE", "full"),
+                        help="full: send the whole resume to Gemini; hybrid: regex first, Gemini only for missing fields")
+    parser.add_argument("--max_pages", type=int, help="Only read the first N pages of the PDF")
+    parser.add_argument("--max_chars", type=int, help="Stop reading the PDF after N characters of text")
+    parser.add_argument("--pattern_timings", action="store_true", help="Print per-regex match timings to stderr")
+    parser.add_argument("--profile", action="store_true",
+                        help="Add per-stage wall/CPU/allocation timings to the output (sampled by RESUME_PROFILE_SAMPLE_RATE otherwise)")
+    parser.add_argument("--cache_max_mb", type=int, default=256, help="Maximum size of the parse cache in MB")
+    parser.add_argument("--metrics_port", type=int, default=int(os.environ.get("RESUME_PARSER_METRICS_PORT") or 0),
+                        help="With --serve, expose Prometheus metrics on this local port (0 disables)")
+    parser.add_argument("--dedupe_index", default=os.environ.get("RESUME_PARSER_DEDUPE_INDEX"),
+                        help="Path to a SQLite MinHash index; near-duplicates of earlier resumes reuse their parse (optional)")
+    parser.add_argument("--dedupe_threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Estimated text similarity (0-1) above which a resume counts as a near-duplicate")
+    parser.add_argument("--pdf_backend",
+                        help=f"PDF text extractor ({', '.join(sorted(PDF_BACKENDS))}; defaults to RESUME_PDF_BACKEND or pypdf2)")
+    parser.add_argument("--artifact_in", help="Rescore a parse artifact written by --artifact_out instead of reading a PDF")
+    parser.add_argument("--artifact_out", help="Write the parse artifact (text, sections, unscored fields) to this JSON file")
     args = parser.parse_args()
+
+    if not args.serve and not args.pdf_path and not args.artifact_in:
+        parser.error("pdf_path is required unless --serve or --artifact_in is given")
     
     # Process job requirements if provided
     job_reqs = None
@@ -328,9 +904,55 @@ if __name__ == "__main__":
     
     # Get API key from args or environment
     api_key = args.api_key or os.environ.get('GEMINI_API_KEY') or load_env_from_file()
+
+    if args.pdf_backend:
+        try:
+            set_default_backend(args.pdf_backend)
+        except ValueError as e:
+            parser.error(str(e))
+
+    cache = ParseCache(args.cache, args.cache_max_mb * 1024 * 1024) if args.cache else None
+    duplicates = DuplicateIndex(args.dedupe_index, args.dedupe_threshold) if args.dedupe_index else None
+
+    if args.pattern_timings:
+        enable_pattern_timing()
+
+    if args.serve:
+        if args.metrics_port:
+            set_stage_observer(lambda name, seconds: STAGE_SECONDS.observe(seconds, stage=name))
+            start_metrics_server(args.metrics_port)
+        if args.socket:
+            serve_unix_socket(args.socket, api_key, cache, args.mode, duplicates)
+        else:
+            serve_stdio(api_key, cache, args.mode, duplicates)
+        sys.exit(0)
     
     # Parse the resume
-    result = parse_resume(args.pdf_path, os.path.basename(args.pdf_path), api_key, job_reqs)
+    profile = start_profile(force=args.profile)
+    if args.artifact_in:
+        try:
+            with open(args.artifact_in, 'r') as f:
+                stored_artifact = json.load(f)
+            filename = os.path.basename(args.pdf_path) if args.pdf_path else ""
+            result, artifact = rescore_from_artifact(stored_artifact, job_reqs, filename, api_key, args.mode)
+        except (OSError, ValueError) as e:
+            print(f"Error reading parse artifact: {e}", file=sys.stderr)
+            sys.exit(1)
+    else:
+        result, artifact = _parse_resume(
+            args.pdf_path, os.path.basename(args.pdf_path), api_key, job_reqs, cache,
+            args.max_pages, args.max_chars, args.mode, duplicates, bool(args.artifact_out)
+        )
+    timings = finish_profile(profile)
+
+    if args.artifact_out:
+        with open(args.artifact_out, 'w') as f:
+            json.dump(artifact, f)
+    if timings:
+        result["timings"] = timings
+    
+    if args.pattern_timings:
+        print(json.dumps({"pattern_timings": pattern_timings()}), file=sys.stderr)
     
     # Print the result as JSON
     print(json.dumps(result, indent=2))
\ No newline at end of file
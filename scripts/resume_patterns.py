@@ -0,0 +1,123 @@
+import os
+import re
+import sys
+import time
+
+# Per-pattern timing is off unless RESUME_PATTERN_TIMING is set or enable_pattern_timing() is called
+_timing_enabled = bool(os.environ.get("RESUME_PATTERN_TIMING"))
+_timings = {}
+
+
+class RegisteredPattern:
+    """A compiled pattern that records its match time when timing is enabled."""
+
+    def __init__(self, name, pattern, flags=0):
+        self.name = name
+        self.regex = re.compile(pattern, flags)
+
+    def _timed(self, input_chars, method, *args):
+        if not _timing_enabled:
+            return method(*args)
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            self._record(time.perf_counter() - start, input_chars)
+
+    def _record(self, elapsed, input_chars):
+        stats = _timings.setdefault(self.name, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "max_input_chars": 0})
+        stats["calls"] += 1
+        stats["total_ms"] += elapsed * 1000
+        if elapsed * 1000 > stats["max_ms"]:
+            stats["max_ms"] = elapsed * 1000
+            stats["max_input_chars"] = input_chars
+
+    def search(self, text, pos=0, endpos=sys.maxsize):
+        return self._timed(min(endpos, len(text)) - pos, self.regex.search, text, pos, endpos)
+
+    def match(self, text, pos=0, endpos=sys.maxsize):
+        return self._timed(min(endpos, len(text)) - pos, self.regex.match, text, pos, endpos)
+
+    def findall(self, text, pos=0, endpos=sys.maxsize):
+        return self._timed(min(endpos, len(text)) - pos, self.regex.findall, text, pos, endpos)
+
+    def finditer(self, text, pos=0, endpos=sys.maxsize):
+        matches = self.regex.finditer(text, pos, endpos)
+        if not _timing_enabled:
+            return matches
+        return self._timed_iter(matches, min(endpos, len(text)) - pos)
+
+    def _timed_iter(self, matches, input_chars):
+        # Time only the scanning, not the caller's work between matches
+        elapsed = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                match = next(matches, None)
+                elapsed += time.perf_counter() - start
+                if match is None:
+                    return
+                yield match
+        finally:
+            self._record(elapsed, input_chars)
+
+    def sub(self, repl, text, count=0):
+        return self._timed(len(text), self.regex.sub, repl, text, count)
+
+
+PATTERNS = {}
+
+
+def register(name, pattern, flags=0):
+    PATTERNS[name] = RegisteredPattern(name, pattern, flags)
+    return PATTERNS[name]
+
+
+def enable_pattern_timing(enabled=True):
+    global _timing_enabled
+    _timing_enabled = enabled
+
+
+def reset_pattern_timings():
+    _timings.clear()
+
+
+def pattern_timings():
+    """Timing stats per pattern name, slowest total first."""
+    return dict(sorted(
+        ((name, {key: round(value, 4) if isinstance(value, float) else value for key, value in stats.items()})
+         for name, stats in _timings.items()),
+        key=lambda item: item[1]["total_ms"],
+        reverse=True
+    ))
+
+
+# Contact details
+EMAIL = register("email", r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+PHONE = register("phone", r'(?:\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+FILENAME_EXTENSION = register("filename_extension", r'\.(pdf|doc|docx)$', re.IGNORECASE)
+FILENAME_SEPARATORS = register("filename_separators", r'[_-]')
+
+# Skills and experience
+SKILLS_LIST = register("skills_list", r'(?:skills|technical skills|core competencies):\s*(?P<skills>[^\.]+)', re.IGNORECASE)
+EXPERIENCE_YEARS = register("experience_years", r'(?P<years>\d+)\+?\s*(?:years?|yrs?)\s*(?:of)?\s*experience', re.IGNORECASE)
+
+# Education. Anchors are whole-word level tokens; every field pattern is run only inside
+# the bounded window after an anchor, and none of them contains an unbounded ".*", so
+# education extraction stays linear in the size of the section. Roman numerals are
+# matched case-sensitively so a stray "x" in prose is not taken for "Class X".
+EDUCATION_ANCHOR = register(
+    "education_anchor",
+    r'\b(?:(?P<twelfth>12th|HSC|Higher Secondary Certificate|(?-i:XII))'
+    r'|(?P<tenth>10th|SSC|Secondary School Certificate|(?-i:X)))\b',
+    re.IGNORECASE
+)
+SCHOOL_KEYWORD = register("school_keyword", r'\b(?:School|College|Institution|Institute|Academy|Vidyalaya)\b', re.IGNORECASE)
+SCHOOL_LEADING_NOISE = register("school_leading_noise", r'(?:(?:from|at|in)\s+|[\d.%]+\s+)+', re.IGNORECASE)
+EDUCATION_YEAR = register("education_year", r'\b(?P<year>(?:19|20)\d{2})\b')
+EDUCATION_PERCENTAGE = register("education_percentage", r'\b(?P<percentage>\d{1,3}(?:\.\d{1,2})?)\s?%')
+
+# Numbers inside already extracted field values ("5 years of experience", "85%", "2012"),
+# parsed once when a candidate record is built
+FIELD_INTEGER = register("field_integer", r'(?P<number>\d+)')
+FIELD_DECIMAL = register("field_decimal", r'(?P<number>\d+(?:\.\d+)?)')
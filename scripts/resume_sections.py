@@ -0,0 +1,97 @@
+import re
+from functools import lru_cache
+
+# Bump when the header vocabulary or matching changes, so stored section offsets are rebuilt
+SECTION_INDEX_VERSION = "1"
+
+# Section name -> header lines that open it. Sections the extractors don't read
+# are still listed so they end the section before them.
+DEFAULT_SECTION_HEADERS = {
+    "summary": ["summary", "profile", "objective", "career objective", "professional summary"],
+    "skills": ["skills", "technical skills", "core competencies"],
+    "experience": ["experience", "work experience", "employment history", "professional experience"],
+    "education": ["education", "qualification", "academic", "educational background"],
+    "projects": ["projects"],
+    "certifications": ["certifications"],
+    "achievements": ["achievements", "awards"],
+    "languages": ["languages"],
+    "personal": ["personal details", "contact"],
+    "hobbies": [
+        "hobbies", "interests", "personal interests", "hobbies and interests", "hobbies & interests",
+        "extra curricular activities", "extra-curricular activities", "extracurricular activities"
+    ],
+    "references": ["references"],
+    "declaration": ["declaration"],
+}
+
+
+NON_SPACE_PATTERN = re.compile(r'\S')
+
+
+@lru_cache(maxsize=8)
+def _compile_headers(header_items):
+    aliases = {}
+    for name, headers in header_items:
+        for header in headers:
+            aliases.setdefault(header.lower(), name)
+    # Longest first so "work experience" wins over "experience"
+    alternation = '|'.join(re.escape(header).replace(r'\ ', r'\s+') for header in sorted(aliases, key=len, reverse=True))
+    pattern = re.compile(r'^[ \t]*(' + alternation + r')[ \t]*:?[ \t]*$', re.IGNORECASE | re.MULTILINE)
+    return pattern, aliases
+
+
+class SectionIndex:
+    """Offsets of each resume section, found in one pass over the text.
+
+    Extractors search within a section with compiled_pattern.search(text, start, end),
+    so no section is ever copied out of the document.
+    """
+
+    def __init__(self, text, headers=None):
+        headers = headers or DEFAULT_SECTION_HEADERS
+        pattern, aliases = _compile_headers(tuple((name, tuple(names)) for name, names in headers.items()))
+
+        self.text = text
+        # (name, header_start, content_start, content_end) in document order
+        self.sections = []
+        matches = list(pattern.finditer(text))
+        for position, match in enumerate(matches):
+            end = matches[position + 1].start() if position + 1 < len(matches) else len(text)
+            name = aliases[re.sub(r'\s+', ' ', match.group(1).lower())]
+            self.sections.append((name, match.start(), match.end(), end))
+        self._index_spans()
+
+    @classmethod
+    def from_sections(cls, text, sections):
+        """Rebuild an index from stored (name, header_start, content_start, content_end) rows
+        without scanning the text again."""
+        index = cls.__new__(cls)
+        index.text = text
+        index.sections = [tuple(section) for section in sections]
+        index._index_spans()
+        return index
+
+    def _index_spans(self):
+        self.spans = {}
+        for name, _, start, end in self.sections:
+            self.spans.setdefault(name, (start, end))
+
+    def span(self, name):
+        """(start, end) of the first section with this name, or the whole text if there is
+        no such section or it is blank."""
+        span = self.spans.get(name)
+        if span is None or not NON_SPACE_PATTERN.search(self.text, *span):
+            return 0, len(self.text)
+        return span
+
+    def has(self, name):
+        return name in self.spans
+
+    def search(self, pattern, name):
+        """Search a compiled pattern within one section, falling back to the whole text."""
+        start, end = self.span(name)
+        return pattern.search(self.text, start, end)
+
+
+def segment_sections(text, headers=None):
+    return SectionIndex(text, headers)
@@ -0,0 +1,106 @@
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+DEFAULT_TAXONOMY_PATH = Path(__file__).parent / "skill_taxonomy.json"
+
+# Characters that may not touch either end of a match, so "java" doesn't match
+# inside "javascript" and "ai" doesn't match inside "maintain"
+WORD_BEFORE = r'(?<![a-z0-9_])'
+WORD_AFTER = r'(?![a-z0-9_+#])'
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def normalize_skill(skill):
+    """Lowercase a skill and collapse internal whitespace."""
+    return WHITESPACE_PATTERN.sub(' ', skill.strip().lower())
+
+
+def _trie_to_pattern(node):
+    """Turn a character trie into a regex that branches on one character at a time."""
+    if '' in node and len(node) == 1:
+        return None
+
+    alternatives = []
+    single_chars = []
+    for char in sorted(key for key in node if key):
+        child = _trie_to_pattern(node[char])
+        # Spaces in multi-word skills match any run of whitespace, including line breaks
+        token = r'\s+' if char == ' ' else re.escape(char)
+        if child is None and char != ' ':
+            single_chars.append(token)
+        else:
+            alternatives.append(token + (child or ''))
+
+    if single_chars:
+        alternatives.append(single_chars[0] if len(single_chars) == 1 else '[' + ''.join(single_chars) + ']')
+
+    pattern = alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+    if '' in node:
+        pattern = '(?:' + pattern + ')?'
+    return pattern
+
+
+class SkillMatcher:
+    """Find every taxonomy skill in a text with one compiled regex.
+
+    The skill names and aliases are merged into a character trie and compiled
+    into a single pattern, so matching is one pass over the text regardless of
+    how many skills the taxonomy holds.
+    """
+
+    def __init__(self, taxonomy):
+        self.version = str(taxonomy.get("version", ""))
+        self.canonical = {}
+        for entry in taxonomy.get("skills", []):
+            name = normalize_skill(entry["name"])
+            for surface in [entry["name"]] + entry.get("aliases", []):
+                self.canonical.setdefault(normalize_skill(surface), name)
+
+        trie = {}
+        for surface in self.canonical:
+            node = trie
+            for char in surface:
+                node = node.setdefault(char, {})
+            node[''] = {}
+
+        body = _trie_to_pattern(trie) if trie else None
+        self.pattern = re.compile(WORD_BEFORE + '(' + body + ')' + WORD_AFTER, re.IGNORECASE) if body else None
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'r') as f:
+            return cls(json.load(f))
+
+    def find_skills(self, text, start=0, end=None):
+        """Return canonical skill names found in text[start:end], in order of first appearance."""
+        if not self.pattern or not text:
+            return []
+
+        found = []
+        seen = set()
+        for match in self.pattern.finditer(text, start, len(text) if end is None else end):
+            name = self.canonical.get(normalize_skill(match.group(1)))
+            if name and name not in seen:
+                seen.add(name)
+                found.append(name)
+        return found
+
+
+_default_matcher = None
+
+
+def get_default_matcher():
+    """Load the taxonomy named by RESUME_SKILL_TAXONOMY (or the bundled one) once per process."""
+    global _default_matcher
+    if _default_matcher is None:
+        path = os.environ.get("RESUME_SKILL_TAXONOMY") or DEFAULT_TAXONOMY_PATH
+        try:
+            _default_matcher = SkillMatcher.from_file(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error loading skill taxonomy {path}: {e}", file=sys.stderr)
+            _default_matcher = SkillMatcher({})
+    return _default_matcher
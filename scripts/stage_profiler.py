@@ -0,0 +1,167 @@
+import contextlib
+import contextvars
+import os
+import random
+import threading
+import time
+import tracemalloc
+
+# Share of parses that are profiled when nobody asks explicitly (0 disables sampling)
+DEFAULT_SAMPLE_RATE = float(os.environ.get("RESUME_PROFILE_SAMPLE_RATE") or 0)
+# tracemalloc slows every thread in the process while it runs; set to 0 to record times only
+TRACK_ALLOCATIONS = os.environ.get("RESUME_PROFILE_ALLOCATIONS", "1") != "0"
+
+_current_profile = contextvars.ContextVar("resume_stage_profile", default=None)
+_NOT_PROFILING = contextlib.nullcontext()
+# Called with (stage name, wall seconds) for every stage, profiled or not; used for metrics
+_stage_observer = None
+
+# tracemalloc is process-wide, so concurrent profiles share one tracing session
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+
+
+def _start_tracing():
+    global _tracing_users
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _tracing_users += 1
+
+
+def _stop_tracing():
+    global _tracing_users
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0:
+            tracemalloc.stop()
+
+
+class StageProfile:
+    """Wall time, CPU time and allocations of each named stage of one parse.
+
+    A stage entered more than once (e.g. scoring in hybrid mode) accumulates.
+    CPU time is per thread, so a stage that waits on the network shows a wall
+    time well above its CPU time. Allocation figures come from tracemalloc and
+    include other threads' allocations when several parses run at once.
+    """
+
+    def __init__(self, track_allocations=TRACK_ALLOCATIONS):
+        self.track_allocations = track_allocations
+        self.stages = {}
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+        # CPU seconds spent under profiling() in other threads; None while the parse stays in this one
+        self._cpu_elsewhere = None
+        # Traced peak of each open stage up to its innermost open child's reset_peak()
+        self._open_peaks = []
+        if track_allocations:
+            _start_tracing()
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        if self.track_allocations:
+            memory_start, peak = tracemalloc.get_traced_memory()
+            if self._open_peaks:
+                # reset_peak() below would lose the enclosing stage's peak so far; carry it
+                self._open_peaks[-1] = max(self._open_peaks[-1], peak)
+            tracemalloc.reset_peak()
+            self._open_peaks.append(0)
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            entry = self.stages.setdefault(name, {"calls": 0, "wall_ms": 0.0, "cpu_ms": 0.0})
+            entry["calls"] += 1
+            entry["wall_ms"] += (time.perf_counter() - wall_start) * 1000
+            entry["cpu_ms"] += (time.thread_time() - cpu_start) * 1000
+            if self.track_allocations:
+                current, peak = tracemalloc.get_traced_memory()
+                peak = max(peak, self._open_peaks.pop())
+                if self._open_peaks:
+                    self._open_peaks[-1] = max(self._open_peaks[-1], peak)
+                entry["alloc_bytes"] = entry.get("alloc_bytes", 0) + max(0, current - memory_start)
+                entry["peak_bytes"] = max(entry.get("peak_bytes", 0), peak - memory_start)
+
+    def finish(self):
+        """Stop allocation tracking and return the timings as a JSON-ready dict."""
+        if self.track_allocations:
+            _stop_tracing()
+        cpu_seconds = self._cpu_elsewhere if self._cpu_elsewhere is not None else time.thread_time() - self._cpu_start
+        return {
+            "wall_ms": round((time.perf_counter() - self._wall_start) * 1000, 3),
+            "cpu_ms": round(cpu_seconds * 1000, 3),
+            "stages": {
+                name: {key: round(value, 3) if isinstance(value, float) else value for key, value in entry.items()}
+                for name, entry in self.stages.items()
+            }
+        }
+
+
+def new_profile(force=False, sample_rate=None):
+    """A StageProfile if this parse is forced or sampled, else None."""
+    rate = DEFAULT_SAMPLE_RATE if sample_rate is None else sample_rate
+    if not force and (rate <= 0 or random.random() >= rate):
+        return None
+    return StageProfile()
+
+
+def start_profile(force=False, sample_rate=None):
+    """Begin profiling the current parse if forced or sampled. Returns a token for finish_profile."""
+    profile = new_profile(force, sample_rate)
+    if profile is None:
+        return None
+    return profile, _current_profile.set(profile)
+
+
+@contextlib.contextmanager
+def profiling(profile):
+    """Record the stages run in this block into profile, for a parse that moves between
+    threads (e.g. pipeline stages). Its CPU time is then the sum over these blocks."""
+    if profile is None:
+        yield
+        return
+    context_token = _current_profile.set(profile)
+    cpu_start = time.thread_time()
+    try:
+        yield
+    finally:
+        profile._cpu_elsewhere = (profile._cpu_elsewhere or 0.0) + time.thread_time() - cpu_start
+        _current_profile.reset(context_token)
+
+
+def finish_profile(token):
+    """End the profile begun by start_profile and return its timings, or None if not profiling."""
+    if token is None:
+        return None
+    profile, context_token = token
+    _current_profile.reset(context_token)
+    return profile.finish()
+
+
+def set_stage_observer(observer):
+    """Report every stage's wall time to observer(name, seconds), e.g. to feed a histogram."""
+    global _stage_observer
+    _stage_observer = observer
+
+
+@contextlib.contextmanager
+def _observed_stage(name, profile):
+    start = time.perf_counter()
+    try:
+        if profile:
+            with profile.stage(name):
+                yield
+        else:
+            yield
+    finally:
+        _stage_observer(name, time.perf_counter() - start)
+
+
+def stage(name):
+    """Context manager timing a stage of the current parse; a shared no-op when not profiling."""
+    profile = _current_profile.get()
+    if _stage_observer:
+        return _observed_stage(name, profile)
+    return profile.stage(name) if profile else _NOT_PROFILING
@@ -0,0 +1,174 @@
+import argparse
+import json
+import os
+import random
+import sys
+import textwrap
+from pathlib import Path
+
+from skill_matcher import DEFAULT_TAXONOMY_PATH
+
+FIRST_NAMES = ["Aarav", "Priya", "Rahul", "Sneha", "Vikram", "Ananya", "Karan", "Meera", "Arjun", "Divya", "Rohan", "Isha"]
+LAST_NAMES = ["Sharma", "Patel", "Iyer", "Gupta", "Reddy", "Nair", "Singh", "Das", "Kulkarni", "Mehta", "Joshi", "Rao"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Systems", "Wayne Digital", "Hooli", "Vandelay Tech"]
+SCHOOL_PREFIXES = ["Delhi Public", "St. Xavier's", "Kendriya", "Modern", "Sunrise", "Green Valley", "Holy Cross", "Narayana"]
+BULLET_VERBS = ["Built", "Designed", "Migrated", "Optimised", "Maintained", "Automated", "Led", "Shipped"]
+BULLET_OBJECTS = [
+    "a billing service", "the reporting pipeline", "an internal dashboard", "the search backend",
+    "CI/CD workflows", "a customer onboarding flow", "the mobile API", "data ingestion jobs"
+]
+
+# Synthetic PDFs use 10pt Helvetica on US Letter with a 12pt line height
+PDF_LINES_PER_PAGE = 58
+PDF_MAX_LINE_CHARS = 95
+
+
+def load_skill_names(path=DEFAULT_TAXONOMY_PATH):
+    with open(path, 'r') as f:
+        return [entry["name"] for entry in json.load(f).get("skills", [])]
+
+
+def generate_resume(seed, skills=10, jobs=2, bullets_per_job=4, filler_lines=0, education_layout="inline",
+                    running_header=False, skill_names=None):
+    """Build one synthetic resume. Returns its text and the fields a parser should find.
+
+    skills, jobs, bullets_per_job and filler_lines control the size; education_layout
+    ("inline" or "block") and running_header control the structure.
+    """
+    rng = random.Random(seed)
+    skill_names = skill_names or load_skill_names()
+
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    email = f"{name.lower().replace(' ', '.')}{seed}@example.com"
+    phone = f"{rng.randint(600, 999)}-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}"
+    chosen_skills = rng.sample(skill_names, min(skills, len(skill_names)))
+    years = rng.randint(1, 15)
+    tenth_year = rng.randint(1995, 2015)
+    education = {
+        "tenth": {
+            "school": f"{rng.choice(SCHOOL_PREFIXES)} School",
+            "year": str(tenth_year),
+            "percentage": f"{rng.randint(60, 98)}%"
+        },
+        "twelfth": {
+            "school": f"{rng.choice(SCHOOL_PREFIXES)} Junior College",
+            "year": str(tenth_year + 2),
+            "percentage": f"{rng.randint(60, 98)}%"
+        }
+    }
+
+    lines = [name, f"Email: {email} | Phone: {phone}", ""]
+    lines += ["Summary", "Software engineer delivering web applications for product teams.", ""]
+    lines += ["Skills", ", ".join(chosen_skills), ""]
+
+    lines += ["Experience", f"{years} years of experience across {jobs} roles"]
+    for job in range(jobs):
+        lines.append(f"Software Engineer, {rng.choice(COMPANIES)} ({2024 - job * 3 - 2} - {2024 - job * 3})")
+        for _ in range(bullets_per_job):
+            lines.append(f"- {rng.choice(BULLET_VERBS)} {rng.choice(BULLET_OBJECTS)} using {rng.choice(chosen_skills)}")
+    for _ in range(filler_lines):
+        lines.append(f"- {rng.choice(BULLET_VERBS)} {rng.choice(BULLET_OBJECTS)} for {rng.choice(COMPANIES)}")
+    lines.append("")
+
+    lines.append("Education")
+    for level, label in (("twelfth", "12th"), ("tenth", "10th")):
+        details = education[level]
+        if education_layout == "block":
+            lines += [label, details["school"], f"{details['year']} | {details['percentage']}"]
+        else:
+            lines.append(f"{label} - {details['school']} - {details['year']} - {details['percentage']}")
+    lines.append("")
+    lines += ["Hobbies", "Reading, trekking and chess"]
+
+    if running_header:
+        header = f"{name} - Resume"
+        lines = [line for start in range(0, len(lines), PDF_LINES_PER_PAGE - 1)
+                 for line in [header] + lines[start:start + PDF_LINES_PER_PAGE - 1]]
+
+    expected = {
+        "name": name,
+        "email": email,
+        "phone": phone,
+        "skills": chosen_skills,
+        "experience": f"{years} years of experience",
+        "education": education
+    }
+    return "\n".join(lines) + "\n", expected
+
+
+def _pdf_escape(line):
+    line = line.encode('latin-1', 'replace').decode('latin-1')
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def text_to_pdf_bytes(text):
+    """Lay plain text out as a minimal text-only PDF, wrapping lines that won't fit the page."""
+    lines = [wrapped for line in text.rstrip('\n').split('\n')
+             for wrapped in (textwrap.wrap(line, PDF_MAX_LINE_CHARS) or [''])]
+    pages = [lines[start:start + PDF_LINES_PER_PAGE] for start in range(0, len(lines), PDF_LINES_PER_PAGE)] or [[]]
+
+    # Object numbers: 1 catalog, 2 page tree, 3 font, then a (page, contents) pair per page
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"
+    }
+    kids = []
+    for index, page_lines in enumerate(pages):
+        page_id, contents_id = 4 + index * 2, 5 + index * 2
+        kids.append(f"{page_id} 0 R")
+        stream = "BT /F1 10 Tf 12 TL 50 750 Td\n" + "".join(f"({_pdf_escape(line)}) Tj T*\n" for line in page_lines) + "ET"
+        stream = stream.encode('latin-1')
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {contents_id} 0 R >>"
+        ).encode('latin-1')
+        objects[contents_id] = b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream"
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>".encode('latin-1')
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = len(output)
+        output += f"{object_id} 0 obj\n".encode() + objects[object_id] + b"\nendobj\n"
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for object_id in sorted(objects):
+        output += f"{offsets[object_id]:010d} 00000 n \n".encode()
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    return bytes(output)
+
+
+def write_corpus(output_dir, count, seed=0, **options):
+    """Write count synthetic resume PDFs and a manifest.jsonl of their expected fields."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    skill_names = load_skill_names()
+    manifest_path = output_dir / "manifest.jsonl"
+    with open(manifest_path, 'w') as manifest:
+        for index in range(count):
+            text, expected = generate_resume(seed + index, skill_names=skill_names, **options)
+            pdf_name = f"resume_{index:05d}.pdf"
+            with open(output_dir / pdf_name, 'wb') as f:
+                f.write(text_to_pdf_bytes(text))
+            manifest.write(json.dumps({"pdf_path": pdf_name, "expected": expected}) + "\n")
+    return manifest_path
+
+
+# Example usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic resume PDFs with known fields")
+    parser.add_argument("output_dir", help="Directory to write PDFs and manifest.jsonl into")
+    parser.add_argument("--count", type=int, default=100, help="Number of resumes to generate")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first resume")
+    parser.add_argument("--skills", type=int, default=10, help="Skills listed per resume")
+    parser.add_argument("--jobs", type=int, default=2, help="Jobs listed per resume")
+    parser.add_argument("--filler_lines", type=int, default=0, help="Extra experience lines, to grow resumes past one page")
+    parser.add_argument("--education_layout", choices=["inline", "block"], default="inline", help="How 10th/12th entries are laid out")
+    parser.add_argument("--running_header", action="store_true", help="Repeat a header line at the top of every page")
+    args = parser.parse_args()
+
+    manifest_path = write_corpus(
+        args.output_dir, args.count, args.seed, skills=args.skills, jobs=args.jobs, filler_lines=args.filler_lines,
+        education_layout=args.education_layout, running_header=args.running_header
+    )
+    print(f"Wrote {args.count} resumes to {os.path.abspath(args.output_dir)} (manifest: {manifest_path})", file=sys.stderr)
@@ -2,11 +2,13 @@ import os
 import sys
 import requests
 import json
-import re
 import time
 from pathlib import Path
 from datetime import datetime
 
+from llm_json import repair_json_object
+from pdf_text import extract_text_from_pdf
+
 # Try to load from .env file if not set in environment
 def load_env_from_file():
     try:
@@ -79,23 +81,6 @@ def test_gemini_api():
         print(f"Error testing Gemini API: {e}")
         return False
 
-# Function to extract text content from a PDF file
-def extract_text_from_pdf(pdf_path):
-    try:
-        import PyPDF2
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page_num in range(len(reader.pages)):
-                text += reader.pages[page_num].extract_text()
-            return text
-    except ImportError:
-        print("PyPDF2 is not installed. Please install it using: pip install PyPDF2")
-        sys.exit(1)
-    except Exception as e:
-        print(f"Error extracting text from PDF: {e}")
-        return None
-
 # Function to analyze resume text using Gemini API
 def analyze_resume(resume_text, job_description=""):
     url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-pro:generateContent"
@@ -157,20 +142,13 @@ def analyze_resume(resume_text, job_description=""):
             response_data = response.json()
             generated_text = response_data["candidates"][0]["content"]["parts"][0]["text"]
             
-            # Try to extract JSON from the response
-            json_match = re.search(r'```json\n(.+?)\n```', generated_text, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(1)
-            else:
-                json_str = generated_text
-            
-            # Clean up the string to make it valid JSON
-            json_str = re.sub(r'[\n\r\t]', '', json_str)
-            
+            # Pull the first JSON object out of the reply, repairing trailing commas and
+            # truncation; newlines inside strings are kept rather than deleted
             try:
-                parsed_json = json.loads(json_str)
+                json_str, _ = repair_json_object(generated_text)
+                parsed_json = json.loads(json_str, strict=False)
                 return parsed_json
-            except json.JSONDecodeError:
+            except ValueError:
                 print("Could not parse JSON from response. Returning raw text.")
                 return {"raw_response": generated_text}
         else: